@@ -1,17 +1,20 @@
-from flask import Flask, request, jsonify, make_response, redirect
+from flask import Flask, Response, g, request, jsonify, make_response, redirect
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
-from models.legal_chat_model import get_legal_advice
+from models.legal_chat_model import get_legal_advice, get_model_answer, prewarm_translations
 from utils.lang import detect_language, translate, translate_pair
 from policy import is_identity_question, is_legal_question, apply_policy
-from utils.form_generator import generate_form
+from utils.form_generator import generate_form as generate_form_text
+from utils.cache import LRUCache, TTLCache
 from utils.db import (
     init_db,
     insert_chat,
     insert_form,
     fetch_all_chats,
     fetch_all_forms,
-    fetch_chats_filtered,
-    fetch_forms_filtered,
+    iter_chats_filtered,
+    iter_forms_filtered,
+    get_table_version,
     create_user,
     get_user_by_email,
     list_lawyer_profiles,
@@ -20,14 +23,26 @@ from utils.db import (
     get_subscription_purchase,
     get_user_subscriptions,
 )
+import atexit
 import logging
 import os
+import queue
 import time
 import json
 import secrets
+import gzip
+import hashlib
+import io
 import re
-from urllib.parse import urlencode
+import html as htmlmod
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
+from datetime import datetime, timedelta, timezone
+import urllib.parse
 import xml.etree.ElementTree as ET
+from werkzeug.exceptions import HTTPException
 
 # --- Securely load env ---
 from dotenv import load_dotenv
@@ -45,18 +60,128 @@ except Exception:
     _check_password_hash = None
     _generate_password_hash = None
 
+# argon2's C implementation releases the GIL while hashing, unlike Werkzeug's
+# pbkdf2/scrypt, so other request threads keep running during login/register.
+try:
+    from argon2 import PasswordHasher
+    from argon2.exceptions import InvalidHashError, VerificationError
+    _password_hasher = PasswordHasher(time_cost=2, memory_cost=65536, parallelism=1)
+except Exception:
+    _password_hasher = None
+
 try:
     import jwt
 except Exception:
     jwt = None
 
-logging.basicConfig(level=logging.INFO)
+JWT_SECRET = os.environ.get('JWT_SECRET', 'secret')
+JWT_ALGORITHMS = ('HS256',)
+
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+try:
+    import redis
+except Exception:
+    redis = None
+
+try:
+    from celery import Celery
+except Exception:
+    Celery = None
+
+try:
+    import hyperscan
+except Exception:
+    hyperscan = None
+
+try:
+    import ahocorasick
+except Exception:
+    ahocorasick = None
+
+try:
+    import tiktoken
+except Exception:
+    tiktoken = None
+
+class _BurstFilter(logging.Filter):
+    """Drop records from a call site logging faster than rate per second (errors always pass).
+
+    Keeps a dead upstream (e.g. every translation failing) from flooding the log.
+    """
+
+    def __init__(self, rate: float = 10.0):
+        super().__init__()
+        self.rate = rate
+        self._buckets: dict = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.ERROR:
+            return True
+        now = time.monotonic()
+        site = (record.pathname, record.lineno)
+        with self._lock:
+            tokens, last = self._buckets.get(site, (self.rate, now))
+            tokens = min(self.rate, tokens + (now - last) * self.rate)
+            if tokens < 1:
+                self._buckets[site] = (tokens, now)
+                return False
+            self._buckets[site] = (tokens - 1, now)
+        return True
+
+
+# Records are formatted on the calling thread and written by a listener thread, so
+# request and translation threads never block on stdout/stderr.
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_log_handler = QueueHandler(_log_queue)
+_log_handler.addFilter(_BurstFilter())
+logging.basicConfig(level=logging.INFO, handlers=[_log_handler])
+_log_listener = QueueListener(_log_queue, logging.StreamHandler())
+_log_listener.start()
+atexit.register(_log_listener.stop)
 logger = logging.getLogger(__name__)
 
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, so jsonify() and request JSON use C encoding."""
+
+    _OPTIONS = orjson.OPT_NON_STR_KEYS if orjson else 0
+
+    def dumps(self, obj, **kwargs) -> str:
+        return self._encode(obj, kwargs.get('indent')).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(self._encode(obj, indent), mimetype=self.mimetype)
+
+    def _encode(self, obj, indent) -> bytes:
+        option = self._OPTIONS | orjson.OPT_INDENT_2 if indent else self._OPTIONS
+        return orjson.dumps(obj, default=self.default, option=option)
+
+
 app = Flask(__name__)
+if orjson is not None:
+    app.json = ORJSONProvider(app)
 # Configure CORS to allow all origins (for development and production)
 CORS(app, resources={r"/*": {"origins": "*"}}, supports_credentials=True)
 
+
+@app.errorhandler(Exception)
+def _internal_server_error(e):
+    """Single catch-all for views that don't map errors to a specific response."""
+    if isinstance(e, HTTPException):
+        return e
+    logger.exception(f"Error in {request.endpoint} endpoint: {e}")
+    return jsonify({'error': 'Internal server error'}), 500
+
+
 # Initialize database - wrap in try/except to prevent import failures
 try:
     init_db()
@@ -67,52 +192,210 @@ except Exception as db_err:
 LAWYER_PORTAL_KEY = os.environ.get('LAWYER_PORTAL_KEY')
 LAWYER_UPI_HANDLE = os.environ.get('LAWYER_UPI_ID', 'cyberverge@upi')
 
+# Emails recently looked up on login that had no account. Absorbs bursts of
+# logins for unknown addresses (credential stuffing) without hitting SQLite.
+# Kept short because each worker process has its own copy.
+_LOGIN_MISS_CACHE: TTLCache = TTLCache(maxsize=50000, ttl=5)
+_LOGIN_MISS_LOCK = threading.Lock()
+
+# Opt-in: translate the static chat texts for all supported languages in the background
+# at start-up, so the first non-English request per language skips Google Translate.
+if os.environ.get('PREWARM_TRANSLATIONS') == '1':
+    prewarm_translations()
+
+# Optional background queue for slow LLM summaries (needs celery and REDIS_URL).
+# Workers: celery -A app.celery_app worker --concurrency=4
+celery_app = None
+if Celery is not None and os.environ.get('REDIS_URL'):
+    celery_app = Celery('nyaysetu', broker=os.environ['REDIS_URL'], backend=os.environ['REDIS_URL'])
+    celery_app.conf.result_expires = 3600
+
+# Summaries of recently uploaded PDFs keyed by SHA-256 of the file bytes, so a
+# re-upload of the same document skips extraction and the LLM call.
+_PDF_SUMMARY_CACHE: LRUCache = LRUCache(maxsize=256)
+_PDF_SUMMARY_LOCK = threading.Lock()
+
 # Legal document detection and summarization helpers
+# Legal keywords and phrases
+_LEGAL_INDICATORS = (
+    'court', 'judge', 'law', 'legal', 'statute', 'act', 'section', 'clause',
+    'plaintiff', 'defendant', 'petitioner', 'respondent', 'witness', 'evidence',
+    'criminal', 'civil', 'appeal', 'judgment', 'order', 'decree', 'verdict',
+    'constitution', 'amendment', 'regulation', 'provision', 'penalty', 'fine',
+    'imprisonment', 'bail', 'warrant', 'summons', 'notice', 'complaint',
+    'fir', 'charge sheet', 'indictment', 'prosecution', 'defense', 'counsel',
+    'advocate', 'attorney', 'barrister', 'solicitor', 'legal opinion',
+    'contract', 'agreement', 'terms', 'conditions', 'liability', 'obligation',
+    'right', 'duty', 'responsibility', 'breach', 'violation', 'infringement',
+    'copyright', 'patent', 'trademark', 'intellectual property', 'privacy',
+    'data protection', 'cyber crime', 'it act', 'information technology',
+    'digital signature', 'electronic record', 'computer evidence'
+)
+
+# Legal document patterns, fused into one alternation (one named group per
+# pattern) so a single finditer sweep tells which of them occur.
+_LEGAL_PATTERNS = re.compile("|".join(f"(?P<p{i}>{p})" for i, p in enumerate((
+    r'\b(?:section|clause|article)\s+\d+',
+    r'\b(?:act|act\s+of)\s+\d{4}',
+    r'\b(?:vs?\.?|versus)\b',
+    r'\b(?:in\s+re|in\s+the\s+matter\s+of)\b',
+    r'\b(?:case\s+no\.?|file\s+no\.?)\b',
+    r'\b(?:court\s+of|high\s+court|supreme\s+court)\b',
+    r'\b(?:bail|warrant|summons|notice)\b',
+    r'\b(?:fir|first\s+information\s+report)\b'
+))), re.IGNORECASE)
+
+# Indicators count only as whole words (ASCII word boundaries on both sides), so
+# 'act' is not found inside 'contract' or 'enact'.
+# One compiled matcher over all indicators: a single pass over the text reports
+# every keyword hit, instead of one scan per indicator.
+# Hyperscan (SIMD multi-pattern DFA) is preferred; pyahocorasick is the fallback.
+_LEGAL_HS = None
+if hyperscan is not None:
+    try:
+        _LEGAL_HS = hyperscan.Database()
+        _LEGAL_HS.compile(
+            expressions=[rb'\b' + re.escape(w).encode('utf-8') + rb'\b' for w in _LEGAL_INDICATORS],
+            ids=list(range(len(_LEGAL_INDICATORS))),
+            elements=len(_LEGAL_INDICATORS),
+            flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(_LEGAL_INDICATORS),
+        )
+    except Exception as e:
+        logger.warning(f"Hyperscan unavailable for legal indicators: {e}")
+        _LEGAL_HS = None
+# Hyperscan scratch space is not thread-safe; keep one per worker thread.
+_hs_tls = threading.local()
+
+if ahocorasick is not None:
+    _LEGAL_AC = ahocorasick.Automaton()
+    for _idx, _word in enumerate(_LEGAL_INDICATORS):
+        _LEGAL_AC.add_word(_word, (_idx, len(_word)))
+    _LEGAL_AC.make_automaton()
+else:
+    _LEGAL_AC = None
+
+# Plain fallback: single-word indicators are a set lookup over the document's
+# tokens; the few multi-word phrases get their own boundary-anchored regex.
+_ASCII_WORD_RE = re.compile(rb'\w+', re.ASCII)
+_LEGAL_WORDS = frozenset(w.encode('ascii') for w in _LEGAL_INDICATORS if ' ' not in w)
+_LEGAL_PHRASE_RES = tuple(
+    re.compile(rb'\b' + re.escape(w.encode('ascii')) + rb'\b', re.ASCII)
+    for w in _LEGAL_INDICATORS if ' ' in w
+)
+
+def _is_ascii_word_char(c: str) -> bool:
+    return c.isascii() and (c.isalnum() or c == '_')
+
+def _count_legal_indicators(text: str, limit: int) -> int:
+    """Count distinct indicators present in text as whole words, stopping once limit is reached.
+
+    Hyperscan matches caselessly on the raw text; the other paths lowercase it once
+    (the plain fallback works on an encoded byte buffer).
+    """
+    seen = set()
+    if _LEGAL_HS is not None:
+        scratch = getattr(_hs_tls, 'scratch', None)
+        if scratch is None:
+            scratch = _hs_tls.scratch = hyperscan.Scratch(_LEGAL_HS)
+
+        def on_match(idx, start, end, flags, context):
+            seen.add(idx)
+            return len(seen) >= limit  # True stops the scan
+
+        try:
+            _LEGAL_HS.scan(text.encode('utf-8'), match_event_handler=on_match, scratch=scratch)
+        except hyperscan.ScanTerminated:
+            pass
+    elif _LEGAL_AC is not None:
+        lowered = text.lower()
+        n = len(lowered)
+        for end, (idx, length) in _LEGAL_AC.iter(lowered):
+            if idx in seen:
+                continue
+            start = end - length + 1
+            if start > 0 and _is_ascii_word_char(lowered[start - 1]):
+                continue
+            if end + 1 < n and _is_ascii_word_char(lowered[end + 1]):
+                continue
+            seen.add(idx)
+            if len(seen) >= limit:
+                break
+    else:
+        buf = text.encode('utf-8', 'ignore').lower()
+        seen.update(_LEGAL_WORDS.intersection(_ASCII_WORD_RE.findall(buf)))
+        for phrase_re in _LEGAL_PHRASE_RES:
+            if len(seen) >= limit:
+                break
+            if phrase_re.search(buf):
+                seen.add(phrase_re.pattern)
+    return min(len(seen), limit)
+
 def detect_legal_document(text: str) -> bool:
     """Detect if the PDF contains legal content based on keywords and patterns."""
-    text_lower = text.lower()
-    
-    # Legal keywords and phrases
-    legal_indicators = [
-        'court', 'judge', 'law', 'legal', 'statute', 'act', 'section', 'clause',
-        'plaintiff', 'defendant', 'petitioner', 'respondent', 'witness', 'evidence',
-        'criminal', 'civil', 'appeal', 'judgment', 'order', 'decree', 'verdict',
-        'constitution', 'amendment', 'regulation', 'provision', 'penalty', 'fine',
-        'imprisonment', 'bail', 'warrant', 'summons', 'notice', 'complaint',
-        'fir', 'charge sheet', 'indictment', 'prosecution', 'defense', 'counsel',
-        'advocate', 'attorney', 'barrister', 'solicitor', 'legal opinion',
-        'contract', 'agreement', 'terms', 'conditions', 'liability', 'obligation',
-        'right', 'duty', 'responsibility', 'breach', 'violation', 'infringement',
-        'copyright', 'patent', 'trademark', 'intellectual property', 'privacy',
-        'data protection', 'cyber crime', 'it act', 'information technology',
-        'digital signature', 'electronic record', 'computer evidence'
-    ]
-    
-    # Count legal indicators
-    legal_count = sum(1 for indicator in legal_indicators if indicator in text_lower)
-    
-    # Check for legal document patterns
-    legal_patterns = [
-        r'\b(?:section|clause|article)\s+\d+',
-        r'\b(?:act|act\s+of)\s+\d{4}',
-        r'\b(?:vs?\.?|versus)\b',
-        r'\b(?:in\s+re|in\s+the\s+matter\s+of)\b',
-        r'\b(?:case\s+no\.?|file\s+no\.?)\b',
-        r'\b(?:court\s+of|high\s+court|supreme\s+court)\b',
-        r'\b(?:bail|warrant|summons|notice)\b',
-        r'\b(?:fir|first\s+information\s+report)\b'
-    ]
-    
-    import re
-    pattern_count = sum(1 for pattern in legal_patterns if re.search(pattern, text_lower))
-    
     # Consider it legal if we find enough indicators
-    return legal_count >= 5 or pattern_count >= 3
+    if _count_legal_indicators(text, 5) >= 5:
+        return True
+    
+    # The patterns are compiled case-insensitive, so no lowered copy of the text is needed
+    matched = set()
+    for m in _LEGAL_PATTERNS.finditer(text):
+        matched.add(m.lastgroup)
+        if len(matched) >= 3:
+            return True
+    return False
+
+# Characters of PDF text worth extracting: enough for the summary prompt
+# (SUMMARY_PROMPT_TOKENS, or SUMMARY_PROMPT_CHARS without tiktoken) plus some
+# slack for legal-document detection.
+SUMMARY_PROMPT_TOKENS = 1000
+SUMMARY_PROMPT_CHARS = 4000
+PDF_TEXT_BUDGET = 6000
+# Below this the model adds little over the extractive summary.
+SUMMARY_MIN_CHARS = 500
+SUMMARY_CACHE_TTL = 7 * 24 * 3600
+
+@lru_cache(maxsize=1)
+def _summary_encoding():
+    """tiktoken encoding for the configured OpenAI model, or None if unavailable."""
+    if tiktoken is None:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(os.environ.get('OPENAI_MODEL', 'gpt-4o-mini'))
+        except KeyError:
+            return tiktoken.get_encoding('o200k_base')
+    except Exception as e:
+        logger.warning(f"tiktoken encoding unavailable, truncating summary prompt by characters: {e}")
+        return None
+
+def _summary_excerpt(text: str) -> str:
+    """Clip text to the summary prompt budget, by tokens when tiktoken is available."""
+    enc = _summary_encoding()
+    if enc is None:
+        return text[:SUMMARY_PROMPT_CHARS]
+    tokens = enc.encode(text, disallowed_special=())
+    if len(tokens) <= SUMMARY_PROMPT_TOKENS:
+        return text
+    return enc.decode(tokens[:SUMMARY_PROMPT_TOKENS])
 
 def generate_legal_summary(text: str, is_legal: bool) -> str:
     """Generate AI-powered summary for legal documents."""
+    return _legal_summary(text, is_legal)[0]
+
+def _legal_summary(text: str, is_legal: bool) -> tuple[str, bool]:
+    """(summary, final); False means the basic summary stood in for a failed model call."""
+    if len(text.strip()) < SUMMARY_MIN_CHARS:
+        # Too short to send to the model: the basic summary is the real answer
+        return generate_basic_summary(text), True
     try:
         # Use the existing legal model for summarization
+        excerpt = _summary_excerpt(text)
+        # Keyed by the excerpt actually sent, so re-saved copies of a PDF (different
+        # bytes, same text) and Celery workers share one model call via Redis.
+        cache_key = _search_cache_key('summary', is_legal, excerpt)
+        cached = _search_cache_get(cache_key)
+        if cached is not None:
+            return cached, True
         if is_legal:
             prompt = f"""Please provide a comprehensive summary of this legal document. Focus on:
 1. Key legal issues and facts
@@ -123,7 +406,7 @@ def generate_legal_summary(text: str, is_legal: bool) -> str:
 6. Any deadlines or important legal requirements
 
 Document text:
-{text[:4000]}  # Limit to avoid token limits
+{excerpt}
 
 Please provide a clear, structured summary suitable for legal professionals."""
         else:
@@ -135,38 +418,95 @@ Please provide a clear, structured summary suitable for legal professionals."""
 5. Main conclusions or recommendations
 
 Document text:
-{text[:4000]}
+{excerpt}
 
 Please provide a clear, structured summary."""
 
-        # Use the existing legal advice function for summarization
-        summary = get_legal_advice(prompt, 'en')
-        return summary if summary else generate_basic_summary(text)
+        # Only a real model answer is cached; the offline legal-advice templates are
+        # no summary, so an outage falls back to the extractive summary uncached.
+        summary = get_model_answer(prompt, 'en')
+        if not summary:
+            return generate_basic_summary(text), False
+        _search_cache_set(cache_key, summary, SUMMARY_CACHE_TTL)
+        return summary, True
         
     except Exception as e:
         logger.error(f"Legal summarization failed: {e}")
-        return generate_basic_summary(text)
+        return generate_basic_summary(text), False
+
+_SENTENCE_RE = re.compile(r'[^.]+')
 
 def generate_basic_summary(text: str) -> str:
     """Generate a basic summary as fallback."""
-    # Split into sentences and take first few meaningful ones
-    sentences = text.split('.')
-    meaningful_sentences = [s.strip() for s in sentences if len(s.strip()) > 20]
-    
-    # Take first 3-5 sentences as summary
-    summary_sentences = meaningful_sentences[:5]
+    # Walk sentences lazily and stop after the first 5 meaningful ones
+    summary_sentences = []
+    for m in _SENTENCE_RE.finditer(text):
+        sentence = m.group().strip()
+        if len(sentence) > 20:
+            summary_sentences.append(sentence)
+            if len(summary_sentences) == 5:
+                break
     summary = '. '.join(summary_sentences)
     
     if summary and not summary.endswith('.'):
         summary += '.'
     
-    return summary or text[:500] + "..." if len(text) > 500 else text
+    return summary or (text[:500] + "..." if len(text) > 500 else text)
+
+def _json() -> dict:
+    """Parse a small fixed-schema JSON body, skipping Werkzeug's get_json() wrapper.
+
+    Malformed or non-object bodies yield {} so the caller's field validation answers.
+    """
+    raw = request.get_data(cache=False)
+    if not raw:
+        return {}
+    try:
+        data = orjson.loads(raw) if orjson else json.loads(raw)
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+def _dumps(obj) -> bytes:
+    return orjson.dumps(obj) if orjson else json.dumps(obj).encode('utf-8')
+
+def _stream_json_list(key: str, rows, etag: str) -> Response:
+    """Stream {key: [rows...]} row by row instead of building the whole body in memory."""
+    def generate():
+        yield b'{"' + key.encode('ascii') + b'":['
+        first = True
+        for row in rows:
+            if not first:
+                yield b','
+            yield _dumps(row)
+            first = False
+        yield b']}'
+    resp = Response(generate(), mimetype='application/json')
+    resp.set_etag(etag)
+    return resp
+
+def _list_etag(key: str, version: int, *query) -> str:
+    """ETag for a listing: the table's write counter plus every query parameter."""
+    return hashlib.sha1(f"{key}:{version}:{query!r}".encode()).hexdigest()
+
+def _limit_arg() -> int | None:
+    """Optional positive ?limit= for list endpoints; anything else means no limit."""
+    try:
+        limit = int(request.args.get('limit') or 0)
+    except ValueError:
+        return None
+    return limit if limit > 0 else None
+
+def _normalize_email(value) -> str:
+    """Trim + lowercase an email once for the auth endpoints; non-strings become ''."""
+    if not isinstance(value, str):
+        return ''
+    return value.strip().lower()
 
 def generate_token(length: int = 32) -> str:
     return secrets.token_urlsafe(length)
 
 def get_current_timestamp() -> str:
-    from datetime import datetime, timezone
     return datetime.now(timezone.utc).isoformat()
 
 
@@ -187,50 +527,66 @@ def _portal_request_authorized() -> bool:
         return str(candidate) == LAWYER_PORTAL_KEY
 
 
+# Central definition of consultation tiers so frontend and APIs stay in sync.
+# Built once; treat as read-only.
+CONSULTATION_TIERS: list[dict] = [
+    {
+        'id': 'basic',
+        'name': '199 / 1 Hour Talk',
+        'price': 199,
+        'currency': 'INR',
+        'duration': '1 hour',
+        'hours': 1,
+        'features': [
+            '1 hour consultation (voice/video/chat)',
+            'Immediate cyber-law triage',
+            'Checklist of documents to gather'
+        ]
+    },
+    {
+        'id': 'standard',
+        'name': '299 / 3 Hours Talk',
+        'price': 299,
+        'currency': 'INR',
+        'duration': '3 hours',
+        'hours': 3,
+        'features': [
+            'Up to 3 hours split across the day',
+            'Detailed analysis of FIR/complaints',
+            'Follow-up call & drafts review'
+        ]
+    },
+    {
+        'id': 'premium',
+        'name': '999 / Premium Lawyers',
+        'price': 999,
+        'currency': 'INR',
+        'duration': 'Premium cyber-law partner',
+        'hours': 8,
+        'featured': True,
+        'features': [
+            'Top-tier cyber lawyer & dedicated VC room',
+            'Full drafting, appeals & representation plan',
+            '24/7 hotline + case manager'
+        ]
+    },
+]
+CONSULTATION_TIERS_BY_ID: dict[str, dict] = {t['id']: t for t in CONSULTATION_TIERS}
+
+
 def get_consultation_tiers() -> list[dict]:
-    """Central definition of consultation tiers so frontend and APIs stay in sync."""
-    return [
-        {
-            'id': 'basic',
-            'name': '199 / 1 Hour Talk',
-            'price': 199,
-            'currency': 'INR',
-            'duration': '1 hour',
-            'hours': 1,
-            'features': [
-                '1 hour consultation (voice/video/chat)',
-                'Immediate cyber-law triage',
-                'Checklist of documents to gather'
-            ]
-        },
-        {
-            'id': 'standard',
-            'name': '299 / 3 Hours Talk',
-            'price': 299,
-            'currency': 'INR',
-            'duration': '3 hours',
-            'hours': 3,
-            'features': [
-                'Up to 3 hours split across the day',
-                'Detailed analysis of FIR/complaints',
-                'Follow-up call & drafts review'
-            ]
-        },
-        {
-            'id': 'premium',
-            'name': '999 / Premium Lawyers',
-            'price': 999,
-            'currency': 'INR',
-            'duration': 'Premium cyber-law partner',
-            'hours': 8,
-            'featured': True,
-            'features': [
-                'Top-tier cyber lawyer & dedicated VC room',
-                'Full drafting, appeals & representation plan',
-                '24/7 hotline + case manager'
-            ]
-        },
-    ]
+    """Return the shared (read-only) consultation tier list."""
+    return CONSULTATION_TIERS
+
+
+# Precompiled patterns for the text/HTML helpers below
+_WS_RE = re.compile(r"\s+")
+_TOKEN_RE = re.compile(r"[a-zA-Z0-9]+")
+_SCRIPT_TAG_RE = re.compile(r"<script[\s\S]*?</script>", re.I)
+_STYLE_TAG_RE = re.compile(r"<style[\s\S]*?</style>", re.I)
+_ANY_TAG_RE = re.compile(r"<[^>]+>")
+_TITLE_RE = re.compile(r"<title[^>]*>([\s\S]*?)</title>", re.I)
+_DDG_RESULT_LINK_RE = re.compile(r"<a[^>]+class=\"result__a\"[^>]+href=\"([^\"]+)\"")
 
 
 def _mask_phone(value: str | None) -> str | None:
@@ -245,7 +601,7 @@ def _mask_phone(value: str | None) -> str | None:
 def _short_text(text: str | None, limit: int = 220) -> str:
     if not text:
         return ''
-    clean = re.sub(r'\s+', ' ', text).strip()
+    clean = _WS_RE.sub(' ', text).strip()
     if len(clean) <= limit:
         return clean
     return clean[: max(0, limit - 3)].rstrip() + '...'
@@ -281,11 +637,21 @@ def _public_lawyer_payload(profile: dict) -> dict:
 
 # Password helpers
 def hash_password(password: str) -> str:
+    if _password_hasher is not None:
+        return _password_hasher.hash(password)
     if _generate_password_hash:
         return _generate_password_hash(password)
     raise RuntimeError("werkzeug.security.generate_password_hash not available. Install Werkzeug.")
 
 def verify_password(password: str, password_hash: str) -> bool:
+    # Accounts created before argon2 was adopted keep their Werkzeug (pbkdf2/scrypt) hashes
+    if password_hash.startswith('$argon2'):
+        if _password_hasher is None:
+            raise RuntimeError("argon2-cffi not installed")
+        try:
+            return _password_hasher.verify(password_hash, password)
+        except (VerificationError, InvalidHashError):
+            return False
     if _check_password_hash:
         return _check_password_hash(password_hash, password)
     raise RuntimeError("werkzeug.security.check_password_hash not available. Install Werkzeug.")
@@ -294,11 +660,11 @@ def verify_password(password: str, password_hash: str) -> bool:
 def create_jwt(payload: dict, expires_minutes: int = 60) -> str:
     if jwt is None:
         raise RuntimeError("PyJWT not installed")
-    import datetime
-    secret = os.environ.get('JWT_SECRET', 'secret')
     p = payload.copy()
-    p['exp'] = datetime.datetime.utcnow() + datetime.timedelta(minutes=expires_minutes)
-    token = jwt.encode(p, secret, algorithm='HS256') # type: ignore
+    p['exp'] = datetime.now(timezone.utc) + timedelta(minutes=expires_minutes)
+    # PyJWT signs HS256 with hmac/hashlib (OpenSSL-backed); the [crypto] extra
+    # pulls in `cryptography` so RS*/ES* keys also go through OpenSSL.
+    token = jwt.encode(p, JWT_SECRET, algorithm=JWT_ALGORITHMS[0]) # type: ignore
     if isinstance(token, bytes):
         token = token.decode('utf-8')
     return token
@@ -306,14 +672,24 @@ def create_jwt(payload: dict, expires_minutes: int = 60) -> str:
 def decode_jwt(token: str) -> dict | None:
     if jwt is None:
         raise RuntimeError("PyJWT not installed")
-    secret = os.environ.get('JWT_SECRET', 'secret')
     try:
-        return jwt.decode(token, secret, algorithms=['HS256']) # type: ignore
+        return jwt.decode(token, JWT_SECRET, algorithms=JWT_ALGORITHMS) # type: ignore
     except Exception as e:
         logger.debug(f"JWT decode failed: {e}")
         return None
 
-def get_current_user():
+def get_claims() -> dict | None:
+    """Decode and verify the bearer token; never touches the database.
+
+    The result is memoized on flask.g so the signature is checked once per request.
+    """
+    if 'claims' in g:
+        return g.claims
+    g.claims = _decode_bearer_claims()
+    return g.claims
+
+
+def _decode_bearer_claims() -> dict | None:
     auth_header = request.headers.get('Authorization', '')
     if not auth_header.startswith('Bearer '):
         return None
@@ -330,33 +706,115 @@ def get_current_user():
     except Exception:
         return None
 
+
+def get_current_user():
+    """Authenticated user as carried in the JWT claims (see get_claims)."""
+    return get_claims()
+
  
 
+# Cache for external search results (Kanoon/RSS/DuckDuckGo) and LLM document summaries.
+# With REDIS_URL set it is shared by all gunicorn workers and survives restarts;
+# otherwise it is per-process.
+_redis_client = None
+if redis is not None and os.environ.get('REDIS_URL'):
+    try:
+        _redis_client = redis.Redis.from_url(os.environ['REDIS_URL'], socket_timeout=0.5)
+    except Exception as e:
+        logger.warning(f"Redis unavailable, using in-process search cache: {e}")
+_SEARCH_CACHE: LRUCache = LRUCache(maxsize=512)
+_SEARCH_CACHE_LOCK = threading.Lock()
+
+
+def _search_cache_key(prefix: str, *parts) -> str:
+    return f"{prefix}:" + hashlib.sha1(_dumps(list(parts))).hexdigest()
+
+
+def _search_cache_get(key: str):
+    if _redis_client is not None:
+        try:
+            raw = _redis_client.get(key)
+        except Exception as e:
+            logger.debug(f"Redis GET failed for {key}: {e}")
+            return None
+        if raw is None:
+            return None
+        return orjson.loads(raw) if orjson else json.loads(raw)
+    with _SEARCH_CACHE_LOCK:
+        entry = _SEARCH_CACHE.get(key)
+    if entry and entry[0] > time.time():
+        return entry[1]
+    return None
+
+
+def _search_cache_set(key: str, value, ttl: int) -> None:
+    if _redis_client is not None:
+        try:
+            _redis_client.setex(key, ttl, _dumps(value))
+        except Exception as e:
+            logger.debug(f"Redis SETEX failed for {key}: {e}")
+        return
+    with _SEARCH_CACHE_LOCK:
+        _SEARCH_CACHE[key] = (time.time() + ttl, value)
+
+
 def _tokenize(text: str) -> set[str]:
     """Very simple tokenizer for similarity scoring."""
-    import re
-    words = re.findall(r"[a-zA-Z0-9]+", (text or "").lower())
+    words = _TOKEN_RE.findall((text or "").lower())
     # Remove very common short tokens
     return {w for w in words if len(w) > 2}
 
 
 def _jaccard(a: set[str], b: set[str]) -> float:
-    if not a or not b:
+    if not a or not b or a.isdisjoint(b):
         return 0.0
+    # |a ∪ b| = |a| + |b| - |a ∩ b|, so no union set needs to be built
     inter = len(a & b)
-    union = len(a | b)
-    return float(inter) / float(union) if union else 0.0
+    return inter / (len(a) + len(b) - inter)
 
 
 def _summarize_text(content: str, max_length: int = 360) -> str:
     """Generate a short, reassuring summary snippet."""
     summary = (content or "").strip()
-    summary = re.sub(r"\s+", " ", summary)
+    summary = _WS_RE.sub(" ", summary)
     if len(summary) > max_length:
         summary = summary[: max(0, max_length - 3)].rstrip() + "..."
     return summary
 
 
+# Shared pool for fanning out independent outbound HTTP calls (RSS feeds, page fetches).
+_IO_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix='nyaysetu-io')
+
+# One keep-alive session for outbound scraping/search calls so TLS connections are
+# reused across requests and across the concurrent fetches above. Transient
+# gateway errors and dropped connections are retried twice with a short backoff.
+_http = None
+if requests is not None:
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+    _http = requests.Session()
+    _http.headers['User-Agent'] = 'Mozilla/5.0'
+    _http_adapter = HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(502, 503, 504), raise_on_status=False),
+    )
+    _http.mount('https://', _http_adapter)
+    _http.mount('http://', _http_adapter)
+
+
+@lru_cache(maxsize=1024)
+def _detect_language_memo(text: str) -> str:
+    return detect_language(text)
+
+
+def _detect_language_cached(text: str) -> str:
+    """detect_language with an LRU for short inputs; users often resend similar prompts."""
+    if len(text) < 512:
+        return _detect_language_memo(text)
+    return detect_language(text)
+
+
 def _parse_rss_feed(rss_url: str, limit: int = 3) -> list[dict]:
     """Parse RSS feed from Indian Kanoon and return case information."""
     results: list[dict] = []
@@ -364,7 +822,7 @@ def _parse_rss_feed(rss_url: str, limit: int = 3) -> list[dict]:
         return results
     
     try:
-        resp = requests.get(rss_url, timeout=8, headers={'User-Agent': 'Mozilla/5.0'})
+        resp = _http.get(rss_url, timeout=8)
         if resp.status_code != 200:
             logger.info(f"RSS feed HTTP {resp.status_code} for {rss_url}")
             return results
@@ -433,6 +891,10 @@ def _search_cases_by_court(
     """Fetch official case summaries from Indian Kanoon RSS feeds."""
     results: list[dict] = []
     court_hints = [h.lower() for h in (court_hints or []) if h]
+    cache_key = _search_cache_key('kanoon', query, court_hints, limit, fallback_court_label)
+    cached = _search_cache_get(cache_key)
+    if cached is not None:
+        return cached
     
     # Use Indian Kanoon RSS feeds
     rss_feeds = {
@@ -482,7 +944,10 @@ def _search_cases_by_court(
             if len(results) >= limit:
                 break
 
-    return results[:limit]
+    results = results[:limit]
+    if results:
+        _search_cache_set(cache_key, results, 3600)
+    return results
 
 
 @app.route('/similar_cases', methods=['POST'])
@@ -572,50 +1037,56 @@ def previous_cases():
         return jsonify({'error': 'Internal server error'}), 500
 
 
-_CASELAW_CACHE: dict[str, dict] = {}
-
-
 def _strip_tags(html: str) -> str:
-    import re
-    text = re.sub(r"<script[\s\S]*?</script>", " ", html, flags=re.I)
-    text = re.sub(r"<style[\s\S]*?</style>", " ", text, flags=re.I)
-    text = re.sub(r"<[^>]+>", " ", text)
-    text = re.sub(r"\s+", " ", text)
+    text = _SCRIPT_TAG_RE.sub(" ", html)
+    text = _STYLE_TAG_RE.sub(" ", text)
+    text = _ANY_TAG_RE.sub(" ", text)
+    text = _WS_RE.sub(" ", text)
     return text.strip()
 
 
 def _extract_title(html: str) -> str:
-    import re
-    m = re.search(r"<title[^>]*>([\s\S]*?)</title>", html, flags=re.I)
+    m = _TITLE_RE.search(html)
     if not m:
         return ""
     title = m.group(1)
-    title = re.sub(r"\s+", " ", title)
+    title = _WS_RE.sub(" ", title)
     return title.strip()
 
 
+def _fetch_page_html(url: str) -> str | None:
+    """GET a page for snippet extraction; None on any error or non-200."""
+    try:
+        resp = _http.get(url, timeout=8)
+    except Exception:
+        return None
+    return resp.text if resp.status_code == 200 else None
+
+
 def _duckduckgo_search_official(q: str, limit: int = 5) -> list[dict]:
     """Query DuckDuckGo HTML for official court domains (no API key)."""
     if requests is None:
         return []
-    import urllib.parse
+    cache_key = _search_cache_key('ddg', q, limit)
+    cached = _search_cache_get(cache_key)
+    if cached is not None:
+        return cached
     # Focus on official domains; keep concise to improve precision
     site_filter = "(site:main.sci.gov.in OR site:*.nic.in OR site:*.gov.in)"
     query = f"{q} judgment {site_filter}"
     params = { 'q': query }
     url = f"https://duckduckgo.com/html/?{urllib.parse.urlencode(params)}"
     try:
-        r = requests.get(url, timeout=8, headers={'User-Agent': 'Mozilla/5.0'})
+        r = _http.get(url, timeout=8)
         if r.status_code != 200:
             return []
         html = r.text
     except Exception:
         return []
 
-    import re, html as htmlmod
     # Extract result links from DDG HTML page (best-effort, structure may change)
     links: list[str] = []
-    for m in re.finditer(r"<a[^>]+class=\"result__a\"[^>]+href=\"([^\"]+)\"", html):
+    for m in _DDG_RESULT_LINK_RE.finditer(html):
         href = htmlmod.unescape(m.group(1))
         # Resolve redirect URLs (uddg param contains the target)
         if '/l/?' in href and 'uddg=' in href:
@@ -628,10 +1099,8 @@ def _duckduckgo_search_official(q: str, limit: int = 5) -> list[dict]:
                 pass
         links.append(href)
 
-    results: list[dict] = []
+    candidates: list[str] = []
     for href in links:
-        if len(results) >= limit:
-            break
         if not href.startswith('http'):
             continue
         # Basic domain allow-listing for safety
@@ -641,11 +1110,16 @@ def _duckduckgo_search_official(q: str, limit: int = 5) -> list[dict]:
             host = ''
         if not any(x in host for x in ['sci.gov.in', '.nic.in', '.gov.in']):
             continue
-        try:
-            pr = requests.get(href, timeout=8, headers={'User-Agent': 'Mozilla/5.0'})
-            if pr.status_code != 200:
+        candidates.append(href)
+
+    # Fetch candidate pages concurrently, a batch of `limit` at a time, until enough
+    # of them succeed; wall time is the slowest page per batch, not the sum.
+    results: list[dict] = []
+    while candidates and len(results) < limit:
+        batch, candidates = candidates[:limit], candidates[limit:]
+        for href, page_html in zip(batch, _IO_POOL.map(_fetch_page_html, batch)):
+            if page_html is None or len(results) >= limit:
                 continue
-            page_html = pr.text
             title = _extract_title(page_html) or href
             text = _strip_tags(page_html)
             snippet = (text[:300] + '...') if len(text) > 300 else text
@@ -657,8 +1131,8 @@ def _duckduckgo_search_official(q: str, limit: int = 5) -> list[dict]:
                 'url': href,
                 'snippet': snippet
             })
-        except Exception:
-            continue
+    if results:
+        _search_cache_set(cache_key, results, 900)
     return results
 
 
@@ -687,12 +1161,11 @@ def case_law():
             limit = 5
         limit = max(1, min(limit, 10))
 
-        # Simple in-memory cache to reduce repeated external calls
-        cache_key = f"{q}::{limit}"
-        cached = _CASELAW_CACHE.get(cache_key)
-        now = time.time()
-        if cached and (now - cached.get('ts', 0) < 600):  # 10 min TTL
-            return jsonify({'cases': cached.get('data', [])}), 200
+        # Cache to reduce repeated external calls
+        cache_key = _search_cache_key('caselaw', q, limit)
+        cached = _search_cache_get(cache_key)
+        if cached is not None:
+            return jsonify({'cases': cached}), 200
 
         api_key = os.environ.get('INDIAN_KANOON_API_KEY')
         results: list[dict] = []
@@ -703,7 +1176,7 @@ def case_law():
                 url = 'https://api.indiankanoon.org/search/'
                 params = {'formInput': q, 'pagenum': 0}
                 headers = {'Authorization': f'Token {api_key}'}
-                resp = requests.get(url, params=params, headers=headers, timeout=8)
+                resp = _http.get(url, params=params, headers=headers, timeout=8)
                 if resp.status_code == 200:
                     data = resp.json()
                     for item in (data.get('results') or [])[:limit]:
@@ -727,103 +1200,115 @@ def case_law():
         if not results:
             results = _duckduckgo_search_official(q, limit=limit)
 
-        _CASELAW_CACHE[cache_key] = {'ts': now, 'data': results}
-        # Bound cache size
-        if len(_CASELAW_CACHE) > 64:
-            try:
-                # remove an arbitrary oldest
-                oldest_key = sorted(_CASELAW_CACHE.items(), key=lambda kv: kv[1].get('ts', 0))[0][0]
-                _CASELAW_CACHE.pop(oldest_key, None)
-            except Exception:
-                pass
+        _search_cache_set(cache_key, results, 600)  # 10 min TTL
 
         return jsonify({'cases': results}), 200
     except Exception as e:
         logger.error(f"Error in case_law endpoint: {e}")
         return jsonify({'error': 'Internal server error'}), 500
 
+# The landing page is static: build it once, with a gzip variant and a weak ETag.
+_ROOT_HTML = (
+    "<html><head><title>NyaySetu</title>"
+    "<meta name='viewport' content='width=device-width, initial-scale=1'/>"
+    "<style>"
+    "body{font-family:Segoe UI,Tahoma,Arial,sans-serif;padding:24px;line-height:1.6;background:#fff;color:#222;}"
+    "code{background:#f5f5f5;padding:2px 6px;border-radius:4px;}"
+    ".box{max-width:980px;margin:auto}"
+    ".grid{display:grid;grid-template-columns:1fr;gap:16px}"
+    "@media(min-width:900px){.grid{grid-template-columns:2fr 1fr}}"
+    ".card{background:#fafafa;border:1px solid #eee;padding:16px;border-radius:12px}"
+    ".button{display:inline-block;padding:12px 16px;border-radius:10px;border:1px solid #ddd;background:#0b5;"
+    "color:#fff;text-decoration:none;margin-right:8px;font-weight:600}"
+    ".button.secondary{background:#2276e3}"
+    ".button.ghost{background:#fff;color:#222;border-color:#bbb}"
+    ".endpoint{background:#fff;border:1px dashed #ddd;padding:10px;border-radius:8px;margin:6px 0}"
+    ".sr-only{position:absolute;width:1px;height:1px;padding:0;margin:-1px;overflow:hidden;clip:rect(0,0,0,0);border:0}"
+    ".big-nav{display:flex;gap:12px;flex-wrap:wrap;margin:12px 0}"
+    ".big-tile{flex:1 1 180px;min-width:180px;border:2px solid #222;border-radius:16px;padding:16px;text-align:center;font-size:18px;"
+    "background:#ffe969}"
+    "</style></head><body><div class='box'>"
+    "<h1>NyaySetu</h1>"
+    "<p><b>Cyber Law Focus.</b> NyaySetu specializes in cyber law: online fraud, cybercrime complaints, data privacy, social media harassment, and electronic evidence. Ask questions, generate relevant forms, and connect with cyber-law lawyers.</p>"
+    "<div class='big-nav'>"
+    "<a class='big-tile' href='#lawyer' aria-label='Book a Lawyer (call or chat)'>🧑‍⚖ Book a Lawyer</a>"
+    "<a class='big-tile' href='#forms' aria-label='Make a Form (simple)'>📝 Make a Form</a>"
+    "<a class='big-tile' href='#chat' aria-label='Ask a Question'>💬 Ask a Question</a>"
+    "</div>"
+    "<div class='grid'>"
+    "  <div>"
+    "    <div id='lawyer' class='card'>"
+    "      <h2>Book a Cyber-Lawyer</h2>"
+    "      <p>See live availability of cyber-law specialists. Phone numbers will be added soon.</p>"
+    "      <a class='button' id='btnCall' href='javascript:void(0)'>📞 Call a Lawyer</a>"
+    "      <a class='button secondary' id='btnChat' href='javascript:void(0)'>💬 Chat to a Lawyer</a>"
+    "      <p id='lawyerNote' style='margin-top:8px;color:#444'>Numbers coming soon. For now, chat opens a placeholder.</p>"
+    "    </div>"
+    "    <div id='forms' class='card'>"
+    "      <h2>Cyber Law Form Generator</h2>"
+    "      <p>Get guided templates for cyber-complaints, online fraud, and data protection.</p>"
+    "      <div class='endpoint'><b>POST</b> <code>/generate_form</code> (Bearer token required)</div>"
+    "    </div>"
+    "    <div id='chat' class='card'>"
+    "      <h2>Ask a Cyber Law Question</h2>"
+    "      <div class='endpoint'><b>POST</b> <code>/chat</code> (Bearer token required)</div>"
+    "    </div>"
+    "    <div id='pdf' class='card'>"
+    "      <h2>Pdf Summarizer (for lawyers)</h2>"
+    "      <form id='pdfForm' enctype='multipart/form-data' method='post' action='/tools/summarize_pdf'>"
+    "        <label for='pdfFile'><b>Select PDF:</b></label><br/>"
+    "        <input name='file' id='pdfFile' type='file' accept='application/pdf' required />"
+    "        <button class='button ghost' type='submit'>Summarize PDF</button>"
+    "      </form>"
+    "      <pre id='pdfOut' style='white-space:pre-wrap;background:#fff;border:1px solid #eee;padding:12px;border-radius:8px;margin-top:10px'></pre>"
+    "    </div>"
+    "  </div>"
+    "  <div>"
+    "    <div class='card'>"
+    "      <h3>API Endpoints (Cyber Law)</h3>"
+    "      <p>Status: healthy. See <code>/health</code>.</p>"
+    "      <h4>Auth</h4>"
+    "      <div class='endpoint'><b>POST</b> <code>/auth/register</code> { email, password }</div>"
+    "      <div class='endpoint'><b>POST</b> <code>/auth/login</code> { email, password }</div>"
+    "      <h4>Data</h4>"
+    "      <div class='endpoint'><b>POST</b> <code>/chat</code></div>"
+    "      <div class='endpoint'><b>POST</b> <code>/generate_form</code></div>"
+    "      <div class='endpoint'><b>GET</b> <code>/data/chats</code> ?start&end&language&q&limit</div>"
+    "      <div class='endpoint'><b>GET</b> <code>/data/forms</code> ?start&end&form_type&q&limit</div>"
+    "      <div class='endpoint'><b>GET</b> <code>/lawyers/availability</code> (Bearer token required)</div>"
+    "    </div>"
+    "  </div>"
+    "</div>"
+    "<script>"
+    "document.getElementById('btnCall').addEventListener('click', function(){alert('Phone numbers will be added by admin soon.');});"
+    "document.getElementById('btnChat').addEventListener('click', function(){alert('Chat with a lawyer coming soon.');});"
+    "async function loadAvailability(){try{const res=await fetch('/lawyers/availability',{headers:{'Authorization':localStorage.getItem('nyaysetu_token')?('Bearer '+localStorage.getItem('nyaysetu_token')):''}});if(!res.ok){return;}const data=await res.json();const el=document.getElementById('lawyerNote');if(el){const lines=(data.lawyers||[]).map(l=>${l.name} — ${l.specialty} — ${l.available?'Available':'Busy'});el.textContent = lines.join('\n') || el.textContent;}}catch(e){}}; loadAvailability();"
+    "document.getElementById('pdfForm').addEventListener('submit', async function(e){e.preventDefault(); const form=new FormData(this); const res=await fetch('/tools/summarize_pdf',{method:'POST', body:form}); const txt=await res.text(); document.getElementById('pdfOut').textContent=txt;});"
+    "</script>"
+    "</div></body></html>"
+).encode('utf-8')
+_ROOT_HTML_GZ = gzip.compress(_ROOT_HTML)
+_ROOT_ETAG = hashlib.md5(_ROOT_HTML).hexdigest()
+
 @app.route('/', methods=['GET'])
 def root():
-    html = (
-        "<html><head><title>NyaySetu</title>"
-        "<meta name='viewport' content='width=device-width, initial-scale=1'/>"
-        "<style>"
-        "body{font-family:Segoe UI,Tahoma,Arial,sans-serif;padding:24px;line-height:1.6;background:#fff;color:#222;}"
-        "code{background:#f5f5f5;padding:2px 6px;border-radius:4px;}"
-        ".box{max-width:980px;margin:auto}"
-        ".grid{display:grid;grid-template-columns:1fr;gap:16px}"
-        "@media(min-width:900px){.grid{grid-template-columns:2fr 1fr}}"
-        ".card{background:#fafafa;border:1px solid #eee;padding:16px;border-radius:12px}"
-        ".button{display:inline-block;padding:12px 16px;border-radius:10px;border:1px solid #ddd;background:#0b5;"
-        "color:#fff;text-decoration:none;margin-right:8px;font-weight:600}"
-        ".button.secondary{background:#2276e3}"
-        ".button.ghost{background:#fff;color:#222;border-color:#bbb}"
-        ".endpoint{background:#fff;border:1px dashed #ddd;padding:10px;border-radius:8px;margin:6px 0}"
-        ".sr-only{position:absolute;width:1px;height:1px;padding:0;margin:-1px;overflow:hidden;clip:rect(0,0,0,0);border:0}"
-        ".big-nav{display:flex;gap:12px;flex-wrap:wrap;margin:12px 0}"
-        ".big-tile{flex:1 1 180px;min-width:180px;border:2px solid #222;border-radius:16px;padding:16px;text-align:center;font-size:18px;"
-        "background:#ffe969}"
-        "</style></head><body><div class='box'>"
-        "<h1>NyaySetu</h1>"
-        "<p><b>Cyber Law Focus.</b> NyaySetu specializes in cyber law: online fraud, cybercrime complaints, data privacy, social media harassment, and electronic evidence. Ask questions, generate relevant forms, and connect with cyber-law lawyers.</p>"
-        "<div class='big-nav'>"
-        "<a class='big-tile' href='#lawyer' aria-label='Book a Lawyer (call or chat)'>🧑‍⚖ Book a Lawyer</a>"
-        "<a class='big-tile' href='#forms' aria-label='Make a Form (simple)'>📝 Make a Form</a>"
-        "<a class='big-tile' href='#chat' aria-label='Ask a Question'>💬 Ask a Question</a>"
-        "</div>"
-        "<div class='grid'>"
-        "  <div>"
-        "    <div id='lawyer' class='card'>"
-        "      <h2>Book a Cyber-Lawyer</h2>"
-        "      <p>See live availability of cyber-law specialists. Phone numbers will be added soon.</p>"
-        "      <a class='button' id='btnCall' href='javascript:void(0)'>📞 Call a Lawyer</a>"
-        "      <a class='button secondary' id='btnChat' href='javascript:void(0)'>💬 Chat to a Lawyer</a>"
-        "      <p id='lawyerNote' style='margin-top:8px;color:#444'>Numbers coming soon. For now, chat opens a placeholder.</p>"
-        "    </div>"
-        "    <div id='forms' class='card'>"
-        "      <h2>Cyber Law Form Generator</h2>"
-        "      <p>Get guided templates for cyber-complaints, online fraud, and data protection.</p>"
-        "      <div class='endpoint'><b>POST</b> <code>/generate_form</code> (Bearer token required)</div>"
-        "    </div>"
-        "    <div id='chat' class='card'>"
-        "      <h2>Ask a Cyber Law Question</h2>"
-        "      <div class='endpoint'><b>POST</b> <code>/chat</code> (Bearer token required)</div>"
-        "    </div>"
-        "    <div id='pdf' class='card'>"
-        "      <h2>Pdf Summarizer (for lawyers)</h2>"
-        "      <form id='pdfForm' enctype='multipart/form-data' method='post' action='/tools/summarize_pdf'>"
-        "        <label for='pdfFile'><b>Select PDF:</b></label><br/>"
-        "        <input name='file' id='pdfFile' type='file' accept='application/pdf' required />"
-        "        <button class='button ghost' type='submit'>Summarize PDF</button>"
-        "      </form>"
-        "      <pre id='pdfOut' style='white-space:pre-wrap;background:#fff;border:1px solid #eee;padding:12px;border-radius:8px;margin-top:10px'></pre>"
-        "    </div>"
-        "  </div>"
-        "  <div>"
-        "    <div class='card'>"
-        "      <h3>API Endpoints (Cyber Law)</h3>"
-        "      <p>Status: healthy. See <code>/health</code>.</p>"
-        "      <h4>Auth</h4>"
-        "      <div class='endpoint'><b>POST</b> <code>/auth/register</code> { email, password }</div>"
-        "      <div class='endpoint'><b>POST</b> <code>/auth/login</code> { email, password }</div>"
-        "      <h4>Data</h4>"
-        "      <div class='endpoint'><b>POST</b> <code>/chat</code></div>"
-        "      <div class='endpoint'><b>POST</b> <code>/generate_form</code></div>"
-        "      <div class='endpoint'><b>GET</b> <code>/data/chats</code> ?start&end&language&q</div>"
-        "      <div class='endpoint'><b>GET</b> <code>/data/forms</code> ?start&end&form_type&q</div>"
-        "      <div class='endpoint'><b>GET</b> <code>/lawyers/availability</code> (Bearer token required)</div>"
-        "    </div>"
-        "  </div>"
-        "</div>"
-        "<script>"
-        "document.getElementById('btnCall').addEventListener('click', function(){alert('Phone numbers will be added by admin soon.');});"
-        "document.getElementById('btnChat').addEventListener('click', function(){alert('Chat with a lawyer coming soon.');});"
-        "async function loadAvailability(){try{const res=await fetch('/lawyers/availability',{headers:{'Authorization':localStorage.getItem('nyaysetu_token')?('Bearer '+localStorage.getItem('nyaysetu_token')):''}});if(!res.ok){return;}const data=await res.json();const el=document.getElementById('lawyerNote');if(el){const lines=(data.lawyers||[]).map(l=>${l.name} — ${l.specialty} — ${l.available?'Available':'Busy'});el.textContent = lines.join('\n') || el.textContent;}}catch(e){}}; loadAvailability();"
-        "document.getElementById('pdfForm').addEventListener('submit', async function(e){e.preventDefault(); const form=new FormData(this); const res=await fetch('/tools/summarize_pdf',{method:'POST', body:form}); const txt=await res.text(); document.getElementById('pdfOut').textContent=txt;});"
-        "</script>"
-        "</div></body></html>"
-    )
-    return make_response(html, 200)
+    if request.if_none_match.contains_weak(_ROOT_ETAG):
+        resp = Response(status=304)
+    elif 'gzip' in request.accept_encodings:
+        resp = Response(_ROOT_HTML_GZ, 200, content_type='text/html; charset=utf-8')
+        resp.headers['Content-Encoding'] = 'gzip'
+    else:
+        resp = Response(_ROOT_HTML, 200, content_type='text/html; charset=utf-8')
+    resp.set_etag(_ROOT_ETAG, weak=True)
+    resp.headers['Cache-Control'] = 'public, max-age=3600'
+    resp.headers['Vary'] = 'Accept-Encoding'
+    return resp
+
+_LAWYER_PAYMENT_INFO = {
+    'upi_handle': LAWYER_UPI_HANDLE,
+    'requires_pre_payment': True,
+    'note': 'Purchase a subscription tier first using /subscriptions/purchase, then use the subscription_id to book a lawyer.'
+}
 
 @app.route('/lawyers/availability', methods=['GET'])
 def lawyers_availability():
@@ -834,17 +1319,12 @@ def lawyers_availability():
             'total': len(public_profiles),
             'available': sum(1 for p in public_profiles if p['is_available']),
         }
-        tiers = get_consultation_tiers()
         return jsonify({
             'lawyers': public_profiles,
             'timestamp': get_current_timestamp(),
             'summary': summary,
-            'tiers': tiers,
-            'payment': {
-                'upi_handle': LAWYER_UPI_HANDLE,
-                'requires_pre_payment': True,
-                'note': 'Purchase a subscription tier first using /subscriptions/purchase, then use the subscription_id to book a lawyer.'
-            }
+            'tiers': CONSULTATION_TIERS,
+            'payment': _LAWYER_PAYMENT_INFO,
         })
     except Exception as e:
         logger.error(f"Error in lawyers_availability: {e}")
@@ -912,8 +1392,7 @@ def purchase_subscription():
             return jsonify({'error': 'payment_reference is required. Please provide your UPI transaction reference.'}), 400
         
         # Validate tier
-        tiers = {t['id']: t for t in get_consultation_tiers()}
-        tier = tiers.get(tier_id)
+        tier = CONSULTATION_TIERS_BY_ID.get(tier_id)
         if not tier:
             return jsonify({'error': 'Invalid subscription tier'}), 400
         
@@ -996,6 +1475,59 @@ def lawyers_book():
 
 
 
+def _build_pdf_summary(full_text: str, is_legal_doc: bool, pages_processed: int) -> tuple[dict, bool]:
+    """Summarize extracted PDF text (LLM with basic fallback) into the API payload.
+
+    Also returns whether the summary is final (worth caching) rather than a stand-in
+    for a failed model call.
+    """
+    # Generate AI-powered summary
+    try:
+        summary, final = _legal_summary(full_text, is_legal_doc)
+    except Exception as e:
+        logger.warning(f"AI summarization failed: {e}")
+        # Fallback to basic summary
+        summary, final = generate_basic_summary(full_text), False
+
+    return {
+        'summary': summary,
+        'is_legal_document': is_legal_doc,
+        'original_length': len(full_text),
+        'summary_length': len(summary),
+        'pages_processed': pages_processed
+    }, final
+
+
+if celery_app is not None:
+    @celery_app.task(name='nyaysetu.summarize_pdf')
+    def summarize_pdf_task(full_text: str, is_legal_doc: bool, pages_processed: int) -> dict:
+        return _build_pdf_summary(full_text, is_legal_doc, pages_processed)[0]
+
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """Poll a background job started with ?async=1."""
+    user = get_current_user()
+    if not user:
+        return jsonify({'error': 'Unauthorized'}), 401
+    if celery_app is None:
+        return jsonify({'error': 'Background jobs are not enabled on this deployment'}), 404
+    # Someone else's job (or an unknown/expired one) looks the same: not found
+    owner = _search_cache_get(_search_cache_key('job-owner', job_id))
+    if owner is None or owner != user.get('user_id'):
+        return jsonify({'error': 'Job not found'}), 404
+
+    res = celery_app.AsyncResult(job_id)
+    if res.failed():
+        logger.error(f"Job {job_id} failed: {res.result}")
+        return jsonify({'job_id': job_id, 'status': res.status, 'error': 'Job failed'}), 200
+    return jsonify({
+        'job_id': job_id,
+        'status': res.status,
+        'result': res.result if res.successful() else None,
+    }), 200
+
+
 @app.route('/tools/summarize_pdf', methods=['POST'])
 def summarize_pdf():
     """AI-powered PDF summariser focused on legal documents.
@@ -1009,26 +1541,46 @@ def summarize_pdf():
         if 'file' not in request.files:
             return jsonify({'error': 'No file uploaded'}), 400
         file = request.files['file']
-        if not file or file.filename.lower().endswith('.pdf') is False:
+        raw = file.read() if file else b''
+        # Sniff the %PDF header (readers accept it within the first 1 KB) rather than
+        # trusting the filename, so non-PDFs never reach the parser.
+        if b'%PDF-' not in raw[:1024]:
             return jsonify({'error': 'Please upload a PDF file'}), 400
 
         # Lazy import to avoid hard dependency during cold start
         try:
-            import PyPDF2  # type: ignore
+            import pypdf  # type: ignore
         except Exception:
-            return jsonify({'error': 'PDF support not installed on server'}), 500
+            try:
+                import PyPDF2 as pypdf  # type: ignore  # legacy name of the same reader API
+            except Exception:
+                return jsonify({'error': 'PDF support not installed on server'}), 500
+
+        digest = hashlib.sha256(raw).hexdigest()
+        with _PDF_SUMMARY_LOCK:
+            cached = _PDF_SUMMARY_CACHE.get(digest)
+        if cached is not None:
+            return jsonify(cached), 200
 
-        reader = PyPDF2.PdfReader(file)
+        reader = pypdf.PdfReader(io.BytesIO(raw))
         extracted: list[str] = []
+        total_chars = 0
         max_pages = min(len(reader.pages), 20)  # Increased limit for legal documents
         for i in range(max_pages):
             try:
                 page = reader.pages[i]
+                # Pages without a content stream (blank or image-only) have no text
+                if '/Contents' not in page:
+                    continue
                 text = page.extract_text() or ''
                 if text:
                     extracted.append(text.strip())
+                    total_chars += len(text)
             except Exception:
                 continue
+            # Detection and the summary prompt only look at the head of the document
+            if total_chars >= PDF_TEXT_BUDGET:
+                break
 
         full_text = "\n".join(extracted).strip()
         if not full_text:
@@ -1036,26 +1588,61 @@ def summarize_pdf():
 
         # Detect if this is a legal document
         is_legal_doc = detect_legal_document(full_text)
-        
-        # Generate AI-powered summary
-        try:
-            summary = generate_legal_summary(full_text, is_legal_doc)
-        except Exception as e:
-            logger.warning(f"AI summarization failed: {e}")
-            # Fallback to basic summary
-            summary = generate_basic_summary(full_text)
 
-        return jsonify({
-            'summary': summary,
-            'is_legal_document': is_legal_doc,
-            'original_length': len(full_text),
-            'summary_length': len(summary),
-            'pages_processed': len(extracted)
-        }), 200
+        # ?async=1 hands the LLM call to a Celery worker and returns a job id to poll
+        if celery_app is not None and request.args.get('async') == '1':
+            job = summarize_pdf_task.delay(full_text, is_legal_doc, len(extracted))
+            # Only the uploader may poll the job; kept as long as Celery keeps the result
+            _search_cache_set(_search_cache_key('job-owner', job.id), user.get('user_id'),
+                              celery_app.conf.result_expires)
+            return jsonify({'job_id': job.id, 'status': 'pending'}), 202
+
+        result, final = _build_pdf_summary(full_text, is_legal_doc, len(extracted))
+        # A stand-in summary is not kept, so a re-upload retries the model once it is back
+        if final:
+            with _PDF_SUMMARY_LOCK:
+                _PDF_SUMMARY_CACHE[digest] = result
+        return jsonify(result), 200
     except Exception as e:
         logger.error(f"Error in summarize_pdf: {e}")
         return jsonify({'error': 'Internal server error'}), 500
 
+# Blank-line separated paragraphs, matched lazily instead of split('\n\n').
+_PARAGRAPH_RE = re.compile(r'(?:[^\n]|\n(?!\n))+')
+
+
+@lru_cache(maxsize=None)
+def _pdf_styles() -> dict:
+    """ReportLab paragraph styles for generated PDFs, built once on first use."""
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib import colors
+
+    styles = getSampleStyleSheet()
+    return {
+        'summary_title': ParagraphStyle(
+            'CustomTitle',
+            parent=styles['Heading1'],
+            fontSize=16,
+            spaceAfter=30,
+            alignment=1,  # Center alignment
+            textColor=colors.darkblue
+        ),
+        'summary_body': ParagraphStyle(
+            'CustomBody',
+            parent=styles['Normal'],
+            fontSize=11,
+            spaceAfter=12,
+            leading=14
+        ),
+        'form_title': ParagraphStyle(
+            'FormTitle', parent=styles['Heading1'], fontSize=16, spaceAfter=20,
+            alignment=1, textColor=colors.darkblue
+        ),
+        'form_body': ParagraphStyle(
+            'FormBody', parent=styles['Normal'], fontSize=11, spaceAfter=10, leading=14
+        ),
+    }
+
 @app.route('/tools/convert_to_pdf', methods=['POST'])
 def convert_to_pdf():
     """Convert summarized text to PDF format."""
@@ -1064,7 +1651,7 @@ def convert_to_pdf():
         if not user:
             return jsonify({'error': 'Unauthorized'}), 401
 
-        data = request.get_json() or {}
+        data = request.get_json(silent=True) or {}
         text = data.get('text', '').strip()
         title = data.get('title', 'Legal Document Summary')
         
@@ -1073,12 +1660,10 @@ def convert_to_pdf():
 
         # Lazy import to avoid hard dependency during cold start
         try:
-            from reportlab.lib.pagesizes import letter, A4
+            from reportlab.lib.pagesizes import A4
             from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-            from reportlab.lib.units import inch
-            from reportlab.lib import colors
             from io import BytesIO
+            styles = _pdf_styles()
         except Exception:
             return jsonify({'error': 'PDF generation support not installed on server'}), 500
 
@@ -1087,39 +1672,18 @@ def convert_to_pdf():
         doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72, 
                               topMargin=72, bottomMargin=18)
         
-        # Get styles
-        styles = getSampleStyleSheet()
-        
-        # Create custom styles
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=16,
-            spaceAfter=30,
-            alignment=1,  # Center alignment
-            textColor=colors.darkblue
-        )
-        
-        body_style = ParagraphStyle(
-            'CustomBody',
-            parent=styles['Normal'],
-            fontSize=11,
-            spaceAfter=12,
-            leading=14
-        )
-        
         # Build PDF content
         story = []
         
         # Add title
-        story.append(Paragraph(title, title_style))
+        story.append(Paragraph(title, styles['summary_title']))
         story.append(Spacer(1, 20))
         
         # Add content
-        paragraphs = text.split('\n\n')
-        for para in paragraphs:
-            if para.strip():
-                story.append(Paragraph(para.strip(), body_style))
+        for m in _PARAGRAPH_RE.finditer(text):
+            para = m.group().strip()
+            if para:
+                story.append(Paragraph(para, styles['summary_body']))
                 story.append(Spacer(1, 6))
         
         # Build PDF
@@ -1156,7 +1720,6 @@ def generate_form_pdf():
             return jsonify({'error': 'Form type is required'}), 400
 
         try:
-            from utils.form_generator import generate_form as generate_form_text
             form_text = generate_form_text(form_type, responses)
         except Exception as gen_err:
             logger.error(f"Form generation failed (PDF): {gen_err}")
@@ -1166,34 +1729,25 @@ def generate_form_pdf():
         try:
             from reportlab.lib.pagesizes import A4
             from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-            from reportlab.lib import colors
             from io import BytesIO
+            styles = _pdf_styles()
         except Exception:
             return jsonify({'error': 'PDF generation support not installed on server'}), 500
 
         buffer = BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72,
                                  topMargin=72, bottomMargin=18)
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            'FormTitle', parent=styles['Heading1'], fontSize=16, spaceAfter=20,
-            alignment=1, textColor=colors.darkblue
-        )
-        body_style = ParagraphStyle(
-            'FormBody', parent=styles['Normal'], fontSize=11, spaceAfter=10, leading=14
-        )
 
         story = []
-        story.append(Paragraph(f"{form_type} Form", title_style))
+        story.append(Paragraph(f"{form_type} Form", styles['form_title']))
         story.append(Spacer(1, 12))
 
         # Split body into paragraphs for basic layout
-        for para in (form_text or '').split('\n\n'):
-            p = para.strip()
+        for m in _PARAGRAPH_RE.finditer(form_text or ''):
+            p = m.group().strip()
             if not p:
                 continue
-            story.append(Paragraph(p.replace('\n', '<br/>'), body_style))
+            story.append(Paragraph(p.replace('\n', '<br/>'), styles['form_body']))
             story.append(Spacer(1, 6))
 
         doc.build(story)
@@ -1242,7 +1796,7 @@ def speech_chat():
             return jsonify({'error': 'Speech-to-text not available on this deployment'}, 501)
 
         # Reuse /chat logic: detect language, translate, answer, translate back
-        detected_lang = lang_hint or detect_language(transcript)
+        detected_lang = lang_hint or _detect_language_cached(transcript)
         _, transcript_en = translate_pair(transcript, detected_lang)
 
         answer = None
@@ -1279,14 +1833,15 @@ def speech_chat():
         logger.error(f"Error in speech_chat endpoint: {e}")
         return jsonify({'error': 'Internal server error'}), 500
 
+# Only the timestamp varies between health probes; the rest of the JSON body is fixed.
+# (A shared Response object can't be reused: after_request hooks such as CORS mutate it.)
+_HEALTH_BODY_PREFIX = b'{"status":"healthy","service":"NyaySetu Legal Aid API","timestamp":'
+
 @app.route('/health', methods=['GET', 'OPTIONS'])
 def health_check():
     """Health check endpoint for monitoring and frontend connectivity checks."""
-    response = jsonify({
-        'status': 'healthy', 
-        'service': 'NyaySetu Legal Aid API',
-        'timestamp': time.time()
-    })
+    body = _HEALTH_BODY_PREFIX + repr(time.time()).encode('ascii') + b'}'
+    response = Response(body, 200, mimetype='application/json')
     # Ensure CORS headers are set
     response.headers.add('Access-Control-Allow-Origin', '*')
     response.headers.add('Access-Control-Allow-Methods', 'GET, OPTIONS')
@@ -1321,8 +1876,7 @@ def _handle_lawyer_booking(user: dict, payload: dict) -> tuple[dict, int]:
         return {'error': f'Subscription is not active. Current status: {subscription["status"]}'}, 400
     
     tier_id = subscription['tier_id']
-    tiers = {t['id']: t for t in get_consultation_tiers()}
-    tier = tiers.get(tier_id)
+    tier = CONSULTATION_TIERS_BY_ID.get(tier_id)
     if not tier:
         return {'error': 'Invalid subscription tier'}, 400
 
@@ -1374,18 +1928,18 @@ def _handle_lawyer_booking(user: dict, payload: dict) -> tuple[dict, int]:
 @app.route('/chat', methods=['POST'])
 def chat():
     try:
-        data = request.get_json() or {}
-        question = (data.get('question') or '').strip()
-        # Auto-detect input language; translate to English for internal processing
-        language = data.get('language') or detect_language(question)
-        detected_lang, question_en = translate_pair(question, language)
-        if not question:
-            return jsonify({'error': 'Question is required'}), 400
-
         user = get_current_user()
         if not user:
             return jsonify({'error': 'Unauthorized'}), 401
 
+        data = request.get_json(silent=True) or {}
+        question = (data.get('question') or '').strip()
+        if not question:
+            return jsonify({'error': 'Question is required'}), 400
+        # Auto-detect input language; translate to English for internal processing
+        language = data.get('language') or _detect_language_cached(question)
+        detected_lang, question_en = translate_pair(question, language)
+
         # Only fetch previous cases if this is a legal question (not identity/unrelated questions)
         previous_cases = []
         is_legal = is_legal_question(question_en)
@@ -1404,12 +1958,17 @@ def chat():
                         'district': 'https://indiankanoon.org/feeds/district.rss'
                     }
                     
-                    # Fetch from all three RSS feeds (supreme, high, district)
-                    for feed_key, feed_url in rss_feeds.items():
+                    # Fetch all three RSS feeds (supreme, high, district) concurrently;
+                    # results are still consumed in that order.
+                    feed_futures = [
+                        (feed_url, _IO_POOL.submit(_parse_rss_feed, feed_url, 3))
+                        for feed_url in rss_feeds.values()
+                    ]
+                    for feed_url, feed_future in feed_futures:
                         if len(previous_cases) >= 5:
                             break
                         try:
-                            feed_results = _parse_rss_feed(feed_url, limit=3)
+                            feed_results = feed_future.result()
                             for item in feed_results:
                                 previous_cases.append({
                                     'title': item.get('title', ''),
@@ -1509,206 +2068,180 @@ def chat():
 @app.route('/auth/register', methods=['POST'])
 def register():
     """Register a new user without email verification."""
-    try:
-        data = request.get_json() or {}
-        email = (data.get('email') or '').strip().lower()
-        password = data.get('password') or ''
-        
-        if not email or not password:
-            return jsonify({'error': 'Email and password are required'}), 400
-        
-        if len(password) < 6:
-            return jsonify({'error': 'Password must be at least 6 characters'}), 400
-        
-        # Check if user already exists
-        existing_user = get_user_by_email(email)
-        if existing_user:
-            return jsonify({'error': 'User with this email already exists'}), 409
-        
-        # Hash password and create user (auto-verified)
-        password_hash = hash_password(password)
-        timestamp = get_current_timestamp()
+    data = _json()
+    email = _normalize_email(data.get('email'))
+    password = data.get('password') or ''
+    
+    if not email or not password:
+        return jsonify({'error': 'Email and password are required'}), 400
+    
+    if len(password) < 6:
+        return jsonify({'error': 'Password must be at least 6 characters'}), 400
+    
+    # Check if user already exists
+    existing_user = get_user_by_email(email)
+    if existing_user:
+        return jsonify({'error': 'User with this email already exists'}), 409
+    
+    # Hash password and create user (auto-verified)
+    password_hash = hash_password(password)
+    timestamp = get_current_timestamp()
 
-        try:
-            # Store as verified by setting verification_token to NULL and is_verified=1 directly
-            # The create_user helper sets is_verified=0 by default, so we mimic creation then set verified
-            user_id = create_user(email, password_hash, None, timestamp)
-        except Exception as db_err:
-            logger.error(f"Failed to create user: {db_err}")
-            return jsonify({'error': 'Failed to create user account'}), 500
+    try:
+        # Single INSERT of an already-verified user (no verification token)
+        user_id = create_user(email, password_hash, None, timestamp, is_verified=1, verified_at=timestamp)
+    except Exception as db_err:
+        logger.error(f"Failed to create user: {db_err}")
+        return jsonify({'error': 'Failed to create user account'}), 500
 
-        # Manually mark verified in DB since create_user sets default 0
-        try:
-            from utils.db import set_user_verified
-            set_user_verified(user_id, timestamp)
-        except Exception as e:
-            logger.error(f"Failed to auto-verify user: {e}")
+    with _LOGIN_MISS_LOCK:
+        _LOGIN_MISS_CACHE.pop(email, None)
 
-        return jsonify({
-            'message': 'Registration successful',
-            'user_id': user_id
-        }), 201
-        
-    except Exception as e:
-        logger.error(f"Error in register endpoint: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+    return jsonify({
+        'message': 'Registration successful',
+        'user_id': user_id
+    }), 201
 
 # Removed /auth/verify endpoint (email verification disabled)
 
 @app.route('/auth/login', methods=['POST'])
 def login():
     """Login user with email and password."""
-    try:
-        data = request.get_json() or {}
-        email = (data.get('email') or '').strip().lower()
-        password = data.get('password') or ''
-        
-        if not email or not password:
-            return jsonify({'error': 'Email and password are required'}), 400
-        
-        user = get_user_by_email(email)
-        if not user:
-            return jsonify({'error': 'Invalid email or password'}), 401
-        
-        # Email verification disabled; skip is_verified check
-        
-        if not verify_password(password, user['password_hash']):
-            return jsonify({'error': 'Invalid email or password'}), 401
-        
-        # Create JWT token
-        # SQLite returns integer IDs, use directly
-        user_id = int(user.get('id', 0))
-        
-        token_payload = {
-            'user_id': user_id,
+    data = _json()
+    email = _normalize_email(data.get('email'))
+    password = data.get('password') or ''
+    
+    if not email or not password:
+        return jsonify({'error': 'Email and password are required'}), 400
+    
+    with _LOGIN_MISS_LOCK:
+        known_miss = email in _LOGIN_MISS_CACHE
+    user = None if known_miss else get_user_by_email(email)
+    if not user:
+        if not known_miss:
+            with _LOGIN_MISS_LOCK:
+                _LOGIN_MISS_CACHE[email] = True
+        return jsonify({'error': 'Invalid email or password'}), 401
+    
+    # Email verification disabled; skip is_verified check
+    
+    if not verify_password(password, user['password_hash']):
+        return jsonify({'error': 'Invalid email or password'}), 401
+    
+    # Create JWT token
+    # SQLite returns integer IDs, use directly
+    user_id = int(user.get('id', 0))
+    
+    token_payload = {
+        'user_id': user_id,
+        'email': user['email'],
+        'verified': user['is_verified']
+    }
+    token = create_jwt(token_payload, expires_minutes=60*24)  # 24 hours
+    
+    return jsonify({
+        'message': 'Login successful',
+        'token': token,
+        'user': {
+            'id': user['id'],
             'email': user['email'],
             'verified': user['is_verified']
         }
-        token = create_jwt(token_payload, expires_minutes=60*24)  # 24 hours
-        
-        return jsonify({
-            'message': 'Login successful',
-            'token': token,
-            'user': {
-                'id': user['id'],
-                'email': user['email'],
-                'verified': user['is_verified']
-            }
-        }), 200
-        
-    except Exception as e:
-        logger.error(f"Error in login endpoint: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+    }), 200
 
 @app.route('/auth/logout', methods=['POST'])
 def logout():
     """Logout user (client-side token invalidation)."""
-    try:
-        user = get_current_user()
-        if not user:
-            return jsonify({'error': 'Not authenticated'}), 401
-        
-        # In a stateless JWT system, logout is handled client-side
-        # by removing the token. We can optionally maintain a blacklist
-        # for additional security, but for simplicity, we'll just return success
-        return jsonify({'message': 'Logout successful'}), 200
-        
-    except Exception as e:
-        logger.error(f"Error in logout endpoint: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+    user = get_claims()
+    if not user:
+        return jsonify({'error': 'Not authenticated'}), 401
+    
+    # In a stateless JWT system, logout is handled client-side
+    # by removing the token. We can optionally maintain a blacklist
+    # for additional security, but for simplicity, we'll just return success
+    return jsonify({'message': 'Logout successful'}), 200
 
 @app.route('/auth/me', methods=['GET'])
 def get_current_user_info():
-    """Get current user information."""
-    try:
-        user = get_current_user()
-        if not user:
-            return jsonify({'error': 'Not authenticated'}), 401
-        
-        return jsonify({
-            'user': {
-                'id': int(user.get('user_id') or user.get('id', 0)),
-                'email': user['email'],
-                'verified': user['verified']
-            }
-        }), 200
-        
-    except Exception as e:
-        logger.error(f"Error in get_current_user_info endpoint: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+    """Get current user information straight from the token claims."""
+    user = get_claims()
+    if not user:
+        return jsonify({'error': 'Not authenticated'}), 401
+    
+    return jsonify({
+        'user': {
+            'id': int(user.get('user_id') or user.get('id', 0)),
+            'email': user['email'],
+            'verified': user['verified']
+        }
+    }), 200
 
 @app.route('/generate_form', methods=['POST'])
 def generate_form():
     """Generate a legal form based on user input."""
+    user = get_claims()
+    if not user:
+        return jsonify({'error': 'Unauthorized'}), 401
+    
+    data = _json()
+    form_type = data.get('form_type') or ''
+    responses = data.get('responses') or {}
+    
+    if not form_type:
+        return jsonify({'error': 'Form type is required'}), 400
+    
     try:
-        data = request.get_json() or {}
-        form_type = data.get('form_type') or ''
-        responses = data.get('responses') or {}
-        
-        if not form_type:
-            return jsonify({'error': 'Form type is required'}), 400
-        
-        user = get_current_user()
-        if not user:
-            return jsonify({'error': 'Unauthorized'}), 401
-        
-        try:
-            from utils.form_generator import generate_form as generate_form_text
-            form_text = generate_form_text(form_type, responses)
-        except Exception as gen_err:
-            logger.error(f"Form generation failed: {gen_err}")
-            return jsonify({'error': 'Failed to generate form'}), 500
-        
-        timestamp = get_current_timestamp()
-        try:
-            form_id = insert_form(form_type, form_text, responses, timestamp)
-        except Exception as db_err:
-            logger.error(f"Failed to persist form: {db_err}")
-            return jsonify({'error': 'Form generated but failed to save'}), 500
-        
-        return jsonify({
-            'form_id': form_id,
-            'form_type': form_type,
-            'form_text': form_text,
-            'responses': responses,
-            'timestamp': timestamp
-        }), 200
-        
-    except Exception as e:
-        logger.error(f"Error in generate_form endpoint: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+        form_text = generate_form_text(form_type, responses)
+    except Exception as gen_err:
+        logger.error(f"Form generation failed: {gen_err}")
+        return jsonify({'error': 'Failed to generate form'}), 500
+    
+    timestamp = get_current_timestamp()
+    try:
+        form_id = insert_form(form_type, form_text, responses, timestamp)
+    except Exception as db_err:
+        logger.error(f"Failed to persist form: {db_err}")
+        return jsonify({'error': 'Form generated but failed to save'}), 500
+    
+    return jsonify({
+        'form_id': form_id,
+        'form_type': form_type,
+        'form_text': form_text,
+        'responses': responses,
+        'timestamp': timestamp
+    }), 200
 
 @app.route('/data/chats', methods=['GET'])
 def get_chats():
-    """Get chat data with optional filters."""
-    try:
-        start = request.args.get('start')
-        end = request.args.get('end')
-        language = request.args.get('language')
-        q = request.args.get('q')
-        
-        chats = fetch_chats_filtered(start=start, end=end, language=language, q=q)
-        return jsonify({'chats': chats}), 200
-        
-    except Exception as e:
-        logger.error(f"Error in get_chats endpoint: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+    """Get chat data with optional filters; ?limit= with ?after=<last id> pages through it."""
+    start = request.args.get('start')
+    end = request.args.get('end')
+    language = request.args.get('language')
+    q = request.args.get('q')
+    limit = _limit_arg()
+    after = request.args.get('after', type=int)
+    
+    etag = _list_etag('chats', get_table_version('chats'), start, end, language, q, limit, after)
+    if request.if_none_match.contains(etag):
+        return Response(status=304, headers={'ETag': f'"{etag}"'})
+    chats = iter_chats_filtered(start=start, end=end, language=language, q=q, limit=limit, after=after)
+    return _stream_json_list('chats', chats, etag)
 
 @app.route('/data/forms', methods=['GET'])
 def get_forms():
-    """Get form data with optional filters."""
-    try:
-        start = request.args.get('start')
-        end = request.args.get('end')
-        form_type = request.args.get('form_type')
-        q = request.args.get('q')
-        
-        forms = fetch_forms_filtered(start=start, end=end, form_type=form_type, q=q)
-        return jsonify({'forms': forms}), 200
-        
-    except Exception as e:
-        logger.error(f"Error in get_forms endpoint: {e}")
-        return jsonify({'error': 'Internal server error'}), 500
+    """Get form data with optional filters; ?limit= with ?after=<last id> pages through it."""
+    start = request.args.get('start')
+    end = request.args.get('end')
+    form_type = request.args.get('form_type')
+    q = request.args.get('q')
+    limit = _limit_arg()
+    after = request.args.get('after', type=int)
+    
+    etag = _list_etag('forms', get_table_version('forms'), start, end, form_type, q, limit, after)
+    if request.if_none_match.contains(etag):
+        return Response(status=304, headers={'ETag': f'"{etag}"'})
+    forms = iter_forms_filtered(start=start, end=end, form_type=form_type, q=q, limit=limit, after=after)
+    return _stream_json_list('forms', forms, etag)
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
@@ -29,11 +29,24 @@ CREATE TABLE IF NOT EXISTS users (
   verified_at TEXT
 );
 
+-- Write counters behind the /data/chats and /data/forms ETags
+CREATE TABLE IF NOT EXISTS table_versions (
+  name TEXT PRIMARY KEY,
+  version INTEGER NOT NULL DEFAULT 0
+);
+INSERT OR IGNORE INTO table_versions (name, version) VALUES ('chats', 0), ('forms', 0);
+CREATE TRIGGER IF NOT EXISTS chats_version_insert AFTER INSERT ON chats BEGIN UPDATE table_versions SET version = version + 1 WHERE name = 'chats'; END;
+CREATE TRIGGER IF NOT EXISTS chats_version_update AFTER UPDATE ON chats BEGIN UPDATE table_versions SET version = version + 1 WHERE name = 'chats'; END;
+CREATE TRIGGER IF NOT EXISTS chats_version_delete AFTER DELETE ON chats BEGIN UPDATE table_versions SET version = version + 1 WHERE name = 'chats'; END;
+CREATE TRIGGER IF NOT EXISTS forms_version_insert AFTER INSERT ON forms BEGIN UPDATE table_versions SET version = version + 1 WHERE name = 'forms'; END;
+CREATE TRIGGER IF NOT EXISTS forms_version_update AFTER UPDATE ON forms BEGIN UPDATE table_versions SET version = version + 1 WHERE name = 'forms'; END;
+CREATE TRIGGER IF NOT EXISTS forms_version_delete AFTER DELETE ON forms BEGIN UPDATE table_versions SET version = version + 1 WHERE name = 'forms'; END;
+
 -- Indexes
-CREATE INDEX IF NOT EXISTS idx_chats_timestamp ON chats (timestamp DESC);
-CREATE INDEX IF NOT EXISTS idx_forms_timestamp ON forms (timestamp DESC);
-CREATE INDEX IF NOT EXISTS idx_chats_language ON chats (language);
-CREATE INDEX IF NOT EXISTS idx_forms_form_type ON forms (form_type);
+CREATE INDEX IF NOT EXISTS idx_chats_timestamp_id ON chats (timestamp DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_forms_timestamp_id ON forms (timestamp DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_chats_language_timestamp ON chats (language, timestamp DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_forms_form_type_timestamp ON forms (form_type, timestamp DESC, id DESC);
 CREATE INDEX IF NOT EXISTS idx_users_email ON users (email);
 CREATE INDEX IF NOT EXISTS idx_users_verified ON users (is_verified);
 
@@ -0,0 +1,17 @@
+"""Gunicorn settings for production: gunicorn -c gunicorn_conf.py app:app"""
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count() + 1))
+# Threaded workers: each thread keeps its own SQLite connection and statement
+# cache (utils.db). Greenlet workers (gevent/eventlet) are not supported: SQLite,
+# argon2, pypdf and reportlab run in C and block the hub, and monkey-patched
+# threading.local would open a fresh, never-closed connection per request.
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+timeout = 60
+graceful_timeout = 30
+keepalive = 5
+accesslog = '-'
+errorlog = '-'
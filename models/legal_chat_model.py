@@ -1,40 +1,236 @@
 import re
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import os
+import logging
+import hashlib
+import threading
+import time
 import requests
 import json
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from utils.cache import LRUCache, TTLCache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# Keep-alive session for the OpenAI API so each chat reuses a pooled TLS connection.
+# Rate limits and transient 5xx are retried with backoff (honouring Retry-After).
+_SESSION = requests.Session()
+_SESSION.headers.update({"Content-Type": "application/json"})
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(
+        total=2,
+        read=0,  # a timed-out completion is not retried: that would multiply the wait
+        backoff_factor=0.3,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=frozenset({"POST"}),
+        raise_on_status=False,
+    ),
+))
+
+# (API key digest, model) pairs that OpenAI answered with 401/403/404, mapped to
+# the monotonic time until which calls with them are skipped.
+_REJECTED_CONFIGS: Dict[tuple, float] = {}
+_REJECTED_CONFIG_TTL = 300
+
+_OPENAI_CONNECT_TIMEOUT = 3.05
+_OPENAI_READ_TIMEOUT = 30.0
+
+# How long a call waits for a free OpenAI slot before using the offline answer.
+_OPENAI_SLOT_WAIT = 5.0
+
+# OpenAI answers keyed on the normalized question, so repeats that differ only in
+# case, punctuation or spacing ("Can I file an FIR?" / "can i file an fir") skip the
+# round-trip. Every word is kept: pronouns and word order decide who does what to whom.
+_ANSWER_CACHE: TTLCache = TTLCache(maxsize=10000, ttl=24 * 3600)
+_ANSWER_CACHE_LOCK = threading.Lock()
+_QUESTION_WORD_RE = re.compile(r"\w+")
+
+# Background translations that can overlap the OpenAI round-trip.
+_TRANSLATION_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix='legal-translate')
+# Paragraph chunks of one long text, translated concurrently. Kept apart from the
+# pool above so a translation running there never waits on its own workers.
+_CHUNK_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix='legal-translate-chunk')
+
+def _paragraph_chunks(text: str, limit: int) -> List[Tuple[str, str]]:
+    """Split text into (chunk, separator) pairs of at most limit characters each.
+
+    Chunks break on blank lines; a paragraph longer than limit is broken after
+    sentences instead, and a sentence longer than limit becomes a chunk of its own.
+    Joining every chunk followed by its separator gives back the original text.
+    """
+    pieces: List[Tuple[str, str]] = []
+    paragraphs = text.split("\n\n")
+    for i, paragraph in enumerate(paragraphs):
+        separator = "\n\n" if i < len(paragraphs) - 1 else ""
+        if len(paragraph) <= limit:
+            pieces.append((paragraph, separator))
+            continue
+        sentences = paragraph.split(". ")
+        for j, sentence in enumerate(sentences):
+            if j < len(sentences) - 1:
+                pieces.append((sentence + ".", " "))
+            else:
+                pieces.append((sentence, separator))
+
+    chunks: List[Tuple[str, str]] = []
+    current, current_sep = "", ""
+    for piece, separator in pieces:
+        if current and len(current) + len(current_sep) + len(piece) > limit:
+            chunks.append((current, current_sep))
+            current, current_sep = piece, separator
+        else:
+            current = current + current_sep + piece if current else piece
+            current_sep = separator
+    chunks.append((current, current_sep))
+    return chunks
+
+
+@lru_cache(maxsize=32)
+def _prompt_parts(prompt: str) -> Tuple[str, str]:
+    """Split a (translated) prompt around the question slot once, not per question.
+
+    If the translator reworded the slot, the question goes at the end rather than being lost.
+    """
+    before, slot, after = prompt.partition(_QUESTION_SLOT)
+    if not slot:
+        return prompt + "\n\n", ""
+    return before, after
+
+
+@lru_cache(maxsize=1)
+def _load_env() -> None:
+    """Load .env once, on the first model call rather than at import."""
+    from dotenv import load_dotenv
+    load_dotenv()
+
+
+class _OpenAIGate:
+    """Per-process cap on concurrent OpenAI calls and, optionally, on calls per minute.
+
+    acquire() returns False instead of letting the call go out when the process is
+    saturated, so the caller can answer offline rather than queue into a 429.
+    """
+
+    def __init__(self, max_concurrency: int, rpm: int):
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._rpm = rpm
+        self._sent: deque = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> bool:
+        if not self._slots.acquire(timeout=_OPENAI_SLOT_WAIT):
+            return False
+        if self._rpm:
+            now = time.monotonic()
+            with self._lock:
+                while self._sent and now - self._sent[0] >= 60:
+                    self._sent.popleft()
+                if len(self._sent) >= self._rpm:
+                    self._slots.release()
+                    return False
+                self._sent.append(now)
+        return True
+
+    def release(self) -> None:
+        self._slots.release()
+
+
+@lru_cache(maxsize=1)
+def _openai_gate() -> _OpenAIGate:
+    """Gate sized from OPENAI_MAX_CONCURRENCY (default 16) and OPENAI_RPM (default unlimited)."""
+    _load_env()
+    try:
+        max_concurrency = max(1, int(os.environ.get('OPENAI_MAX_CONCURRENCY', '16')))
+        rpm = max(0, int(os.environ.get('OPENAI_RPM', '0')))
+    except ValueError:
+        max_concurrency, rpm = 16, 0
+    return _OpenAIGate(max_concurrency, rpm)
+
+
+@lru_cache(maxsize=1)
+def _shared_cache():
+    """Redis client shared by all workers when REDIS_URL is set, else None."""
+    _load_env()
+    if redis is None or not os.environ.get('REDIS_URL'):
+        return None
+    try:
+        return redis.Redis.from_url(os.environ['REDIS_URL'], socket_timeout=0.5)
+    except Exception as e:
+        logger.warning(f"Redis unavailable, translations cached per process only: {e}")
+        return None
+
+
+@lru_cache(maxsize=1)
+def _google_translator_cls():
+    """deep-translator's GoogleTranslator, imported on first translation; None if not installed."""
+    try:
+        from deep_translator import GoogleTranslator
+    except ImportError:
+        return None
+    return GoogleTranslator
+
+
+try:
+    import ahocorasick
+except Exception:
+    ahocorasick = None
 
-# Load environment variables
-from dotenv import load_dotenv
-load_dotenv()
+try:
+    import orjson
+except Exception:
+    orjson = None
 
-# Import translation library
 try:
-    from deep_translator import GoogleTranslator
-    _translator_available = True
-except ImportError:
-    _translator_available = False
+    import redis
+except Exception:
+    redis = None
+
+# Google Translate rejects requests over 5000 characters; batched texts are joined
+# with a marker it leaves untouched.
+_TRANSLATE_MAX_CHARS = 5000
+# Longer texts are split on paragraph (or sentence) boundaries into chunks of about this size.
+_TRANSLATE_CHUNK_CHARS = 2000
+_BATCH_SEPARATOR = "\n\n[[[#]]]\n\n"
+# Where the question goes in the legal prompt. Unlike a str.format field it
+# survives translation intact and braces in the translated text are harmless.
+_QUESTION_SLOT = "[[[Q]]]"
+# Shape of a language code the translator could accept ('hi', 'zh-CN'); anything
+# else is passed through untranslated without building a translator.
+_LANGUAGE_CODE_RE = re.compile(r'[A-Za-z]{2,3}(?:-[A-Za-z]{2,4})?')
+# After this many translation failures for a language within the window, that
+# language is served untranslated for the block period.
+_TRANSLATE_MAX_FAILURES = 3
+_TRANSLATE_FAILURE_WINDOW = 60
+_TRANSLATE_BLOCK_SECONDS = 120
+# How long a translation stays in the shared Redis cache.
+_TRANSLATION_TTL = 7 * 24 * 3600
+
+# Language codes the app offers; membership only, so a frozenset rather than an identity dict.
+_SUPPORTED_LANGUAGES = frozenset({
+    'en',
+    'hi',  # Hindi
+    'or',  # Odia
+    'bn',  # Bengali
+    'ta',  # Tamil
+    'te',  # Telugu
+    'mr',  # Marathi
+    'gu',  # Gujarati
+    'kn',  # Konkani
+    'ml',  # Malayalam
+    'pa',  # Punjabi
+    'ka',  # Kannada
+})
 
 class LegalAdviceGenerator:
     """Advanced legal advice generator with multi-language support using deep-translator"""
     
     def __init__(self):
-        # Language mapping for translation
-        self.language_mapping = {
-            'en': 'en',
-            'hi': 'hi',  # Hindi
-            'or': 'or',  # Odia
-            'bn': 'bn',  # Bengali
-            'ta': 'ta',  # Tamil
-            'te': 'te',  # Telugu
-            'mr': 'mr',  # Marathi
-            'gu': 'gu',  # Gujarati
-            'kn': 'kn',  # Konkani
-            'ml': 'ml',  # Malayalam
-            'pa': 'pa',  # Punjabi
-            'ka': 'ka',  # Kannada 
-        }
-        
         # Base English legal prompt - will be translated to other languages
         self.base_legal_prompt = """You are a legal AI assistant specializing in Indian law. Provide clear, practical legal advice based on Indian legal framework.
 
@@ -62,52 +258,259 @@ Always cite specific laws, sections, or articles when providing legal informatio
 
 Keep responses helpful, accurate, and actionable. Format everything in clear points. If you're unsure about specific legal details, recommend consulting a qualified lawyer.
 
-Question: {question}
+Question: [[[Q]]]
 
 Provide legal advice in point format:"""
         
         # Base fallback response - will be translated to other languages
         self.base_fallback_response = 'I apologize, but I\'m currently unable to provide detailed legal advice. Please consult a qualified lawyer for your specific situation.'
+
+        # System instruction sent with every OpenAI call - will be translated too
+        self.base_instruction = """You are a helpful legal AI for Indian law. Answer clearly and practically in POINT FORMAT (use bullet points or numbered lists). Always reference current Indian legal framework (BNS, BNSS, BSA instead of IPC, CrPC, Evidence Act). Cite specific laws and sections. If unsure, advise consulting a qualified lawyer.
+
+FORMATTING REQUIREMENTS:
+- Always format answers as bullet points (-) or numbered points (1., 2., 3.)
+- Use bold (**text**) for emphasis on important terms, laws, or sections
+- Use headers (##) for major sections
+- Keep each point concise and clear
+- Organize information in logical sections with clear headers
+- NEVER write long paragraphs. Always break information into points.
+
+When answering questions, you have access to previous court cases and their results. Use this information to:
+1. Reference similar cases and their outcomes
+2. Provide context about how similar situations were handled
+3. Explain patterns or precedents from previous cases
+4. Help users understand what to expect based on similar cases
+
+Always prioritize accuracy and cite specific laws and sections. Format everything in clear, organized points.
+IMPORTANT: You must respond in the same language as this instruction. All your responses must be written entirely in the language of this instruction."""
+
+        # Translations of the static texts above, per language. They never change,
+        # so each costs one Google Translate round-trip per process.
+        self._prompt_cache: Dict[str, str] = {}
+        self._instruction_cache: Dict[str, str] = {}
+        self._fallback_cache: Dict[str, str] = {}
+
+        # Any other translated text, keyed by (digest of text, language). Translators
+        # are reused per thread: GoogleTranslator keeps per-call state on the instance.
+        self._translation_cache: LRUCache = LRUCache(maxsize=512)
+        self._translation_lock = threading.Lock()
+        self._translators = threading.local()
+        # Well-formed codes the translator turned down, so they are not retried
+        self._unsupported_languages: set = set()
+        # Languages whose translations keep failing (rate limits, outages) are
+        # passed through untranslated for a while instead of waiting on each call.
+        self._translate_failures: Dict[str, tuple] = {}
+        self._translate_blocked_until: Dict[str, float] = {}
     
     def translate_text(self, text: str, target_language: str) -> str:
         """Translate text to target language using deep-translator"""
-        if not _translator_available:
-            return text
-        
-        if target_language == 'en':
-            return text
+        return self._translate(text, target_language)[0]
+
+    def _translate(self, text: str, target_language: str) -> Tuple[str, bool]:
+        """translate_text plus whether a translation was obtained (False: text came back as is)."""
+        if not self._can_translate(target_language):
+            return text, False
         
+        digest = hashlib.blake2b(text.encode('utf-8'), digest_size=16).digest()
+        key = (digest, target_language)
+        with self._translation_lock:
+            cached = self._translation_cache.get(key)
+        if cached is not None:
+            return cached, True
+
+        if len(text) > _TRANSLATE_CHUNK_CHARS:
+            chunks = _paragraph_chunks(text, _TRANSLATE_CHUNK_CHARS)
+            if len(chunks) > 1:
+                # Each chunk is its own request (and cache entry), run side by side
+                results = list(_CHUNK_POOL.map(lambda chunk: self._translate(chunk[0], target_language), chunks))
+                translated = "".join(part + separator for (part, _), (_, separator) in zip(results, chunks))
+                ok = all(chunk_ok for _, chunk_ok in results)
+                # A failed chunk came back in English; cache the whole only when none did
+                if ok:
+                    with self._translation_lock:
+                        self._translation_cache[key] = translated
+                return translated, ok
+
+        shared = _shared_cache()
+        shared_key = f"translate:{target_language}:{digest.hex()}"
+        if shared is not None:
+            try:
+                raw = shared.get(shared_key)
+            except Exception as e:
+                logger.debug(f"Redis GET failed for {shared_key}: {e}")
+                raw = None
+            if raw is not None:
+                translated = raw.decode('utf-8')
+                with self._translation_lock:
+                    self._translation_cache[key] = translated
+                return translated, True
+
         try:
-            translator = GoogleTranslator(source='en', target=target_language)
-            translated = translator.translate(text)
-            return translated
+            translated = self._get_translator(target_language).translate(text)
         except Exception as e:
             # If translation fails, return original text
-            print(f"Translation error: {str(e)}")
-            return text
+            logger.warning(f"Translation error: {e}")
+            self._record_translate_failure(target_language)
+            return text, False
+        if not translated:
+            return translated, False
+        with self._translation_lock:
+            self._translation_cache[key] = translated
+        if shared is not None:
+            try:
+                shared.setex(shared_key, _TRANSLATION_TTL, translated)
+            except Exception as e:
+                logger.debug(f"Redis SETEX failed for {shared_key}: {e}")
+        return translated, True
+
+    def _can_translate(self, target_language) -> bool:
+        """Cheap local checks before any translator is built or request sent."""
+        if _google_translator_cls() is None or target_language == 'en':
+            return False
+        if self._translate_blocked_until.get(target_language, 0) > time.monotonic():
+            return False
+        if target_language in _SUPPORTED_LANGUAGES:
+            return True
+        return (
+            isinstance(target_language, str)
+            and target_language not in self._unsupported_languages
+            and _LANGUAGE_CODE_RE.fullmatch(target_language) is not None
+        )
+
+    def _record_translate_failure(self, target_language: str) -> None:
+        """Block a language for _TRANSLATE_BLOCK_SECONDS after repeated failures."""
+        now = time.monotonic()
+        count, first_failed = self._translate_failures.get(target_language, (0, now))
+        if now - first_failed > _TRANSLATE_FAILURE_WINDOW:
+            count, first_failed = 0, now
+        count += 1
+        if count >= _TRANSLATE_MAX_FAILURES:
+            self._translate_blocked_until[target_language] = now + _TRANSLATE_BLOCK_SECONDS
+            logger.warning(f"Translation to {target_language} failing repeatedly; skipping it for {_TRANSLATE_BLOCK_SECONDS}s")
+            self._translate_failures.pop(target_language, None)
+        else:
+            self._translate_failures[target_language] = (count, first_failed)
+
+    def _get_translator(self, target_language: str):
+        translators = getattr(self._translators, 'by_language', None)
+        if translators is None:
+            translators = self._translators.by_language = {}
+        translator = translators.get(target_language)
+        if translator is None:
+            try:
+                translator = _google_translator_cls()(source='en', target=target_language)
+            except Exception:
+                # deep-translator validates the code locally; don't retry it per request
+                self._unsupported_languages.add(target_language)
+                raise
+            translators[target_language] = translator
+        return translator
     
+    def translate_texts(self, texts: List[str], target_language: str) -> List[str]:
+        """Translate several texts with one Google Translate request where possible.
+
+        The texts are joined with a separator and split again afterwards; if the
+        separator does not survive translation, each text is translated on its own.
+        """
+        if not self._can_translate(target_language) or len(texts) < 2:
+            return [self.translate_text(text, target_language) for text in texts]
+        joined = _BATCH_SEPARATOR.join(texts)
+        if len(joined) > _TRANSLATE_MAX_CHARS:
+            return [self.translate_text(text, target_language) for text in texts]
+        try:
+            parts = (self._get_translator(target_language).translate(joined) or '').split(_BATCH_SEPARATOR.strip())
+        except Exception as e:
+            logger.warning(f"Translation error: {e}")
+            self._record_translate_failure(target_language)
+            parts = []
+        if len(parts) != len(texts):
+            return [self.translate_text(text, target_language) for text in texts]
+        return [part.strip() for part in parts]
+
+    def prefetch_openai_texts(self, language: str) -> None:
+        """Translate the prompt and instruction together on the first request in a language."""
+        if language == 'en':
+            return
+        missing = [
+            (cache, text)
+            for cache, text in (
+                (self._instruction_cache, self.base_instruction),
+                (self._prompt_cache, self.base_legal_prompt),
+            )
+            if language not in cache
+        ]
+        if len(missing) < 2:
+            return
+        translated = self.translate_texts([text for _, text in missing], language)
+        for (cache, text), result in zip(missing, translated):
+            if result and result != text:
+                cache[language] = result
+
+    def prefetch_cached_texts(self, items: List[Tuple[Dict[str, str], str]], language: str) -> None:
+        """Fill per-language caches for several static texts, packing as many as fit into each request."""
+        if language == 'en':
+            return
+        batch: List[Tuple[Dict[str, str], str]] = []
+        size = 0
+        for cache, text in items:
+            if language in cache:
+                continue
+            if batch and size + len(_BATCH_SEPARATOR) + len(text) > _TRANSLATE_MAX_CHARS:
+                self._fill_caches(batch, language)
+                batch, size = [], 0
+            size += len(text) + (len(_BATCH_SEPARATOR) if batch else 0)
+            batch.append((cache, text))
+        if batch:
+            self._fill_caches(batch, language)
+
+    def _fill_caches(self, batch: List[Tuple[Dict[str, str], str]], language: str) -> None:
+        translated = self.translate_texts([text for _, text in batch], language)
+        for (cache, text), result in zip(batch, translated):
+            if result and result != text:
+                cache[language] = result
+
+    def _translate_cached(self, cache: Dict[str, str], text: str, language: str) -> str:
+        """Translate a static text once per language; failed translations are retried next time."""
+        cached = cache.get(language)
+        if cached is not None:
+            return cached
+        translated = self.translate_text(text, language)
+        if translated and translated != text:
+            cache[language] = translated
+        return translated
+
     def get_legal_prompt(self, question: str, language: str = 'en') -> str:
         """Get appropriate legal prompt for the language using translation"""
         if language == 'en':
-            return self.base_legal_prompt.format(question=question)
+            prompt = self.base_legal_prompt
         else:
             # Translate the base prompt to the target language
-            translated_prompt = self.translate_text(self.base_legal_prompt, language)
-            return translated_prompt.format(question=question)
+            prompt = self._translate_cached(self._prompt_cache, self.base_legal_prompt, language)
+        before, after = _prompt_parts(prompt)
+        return before + question + after
     
+    def get_translated_instruction(self, language: str = 'en') -> str:
+        """Get the OpenAI system instruction in the requested language"""
+        if language == 'en':
+            return self.base_instruction
+        return self._translate_cached(self._instruction_cache, self.base_instruction, language)
+
     def get_fallback_response(self, language: str = 'en') -> str:
         """Get fallback response when all AI models are not available"""
         if language == 'en':
             return self.base_fallback_response
         else:
-            return self.translate_text(self.base_fallback_response, language)
+            return self._translate_cached(self._fallback_cache, self.base_fallback_response, language)
 
-# Global instance
-legal_advisor = LegalAdviceGenerator()
+@lru_cache(maxsize=1)
+def _advisor() -> LegalAdviceGenerator:
+    """The shared generator, built on first use rather than at import."""
+    return LegalAdviceGenerator()
 
 # Keyword inventories reused by the offline heuristic responder. They intentionally
 # cover common Indian languages so that simple substring checks still match.
-TENANT_KEYWORDS = [
+TENANT_KEYWORDS = (
     'tenant', 'rent', 'eviction', 'landlord', 'lease', 'rental',
     'किरायेदार', 'किराया', 'बेदखली', 'मकान मालिक', 'लीज', 'किराये',
     'ভাড়াটিয়া', 'ভাড়া', 'উচ্ছেদ', 'বাড়িওয়ালা', 'লিজ',
@@ -119,10 +522,10 @@ TENANT_KEYWORDS = [
     'ਕਿਰਾਏਦਾਰ', 'ਘਰ ਮਾਲਕ',
     'ಬಾಡಿಗೆದಾರ', 'ಮನೆ ಮಾಲೀಕ',
     'ଭଡ଼ାଦାର', 'ଘର ମାଲିକ'
-]
+)
 
 # Keywords for filing FIR (general police complaints)
-FIR_KEYWORDS = [
+FIR_KEYWORDS = (
     'fir', 'file fir', 'filing fir', 'police complaint', 'register complaint', 'police report',
     'एफआईआर दर्ज', 'पुलिस शिकायत', 'शिकायत दर्ज',
     'এফআইআর দায়ের', 'পুলিশ অভিযোগ',
@@ -133,10 +536,10 @@ FIR_KEYWORDS = [
     'ਏਫਆਈਆਰ ਦਰਜ', 'ਪੁਲਿਸ ਸ਼ਿਕਾਇਤ',
     'ಎಫ್ಐಆರ್ ದಾಖಲೆ', 'ಪೊಲೀಸ್ ದೂರು',
     'ଏଫଆଇଆର ଦାଖଲ', 'ପୋଲିସ ଅଭିଯୋଗ'
-]
+)
 
 # Keywords for arrest rights (specific to rights when arrested)
-ARREST_RIGHTS_KEYWORDS = [
+ARREST_RIGHTS_KEYWORDS = (
     'arrest', 'arrested', 'rights if arrested', 'what are my rights', 'arrest rights', 'police arrest',
     'गिरफ्तार', 'गिरफ्तारी', 'अधिकार', 'गिरफ्तारी के अधिकार',
     'গ্রেফতার', 'অধিকার', 'গ্রেফতারের অধিকার',
@@ -148,10 +551,10 @@ ARREST_RIGHTS_KEYWORDS = [
     'ਗਿਰਫਤਾਰੀ', 'ਅਧਿਕਾਰ', 'ਗਿਰਫਤਾਰੀ ਅਧਿਕਾਰ',
     'ಅರೆಸ್ಟ್', 'ಅಧಿಕಾರಗಳು', 'ಅರೆಸ್ಟ್ ಅಧಿಕಾರಗಳು',
     'ଗିରଫତାରି', 'ଅଧିକାର', 'ଗିରଫତାରି ଅଧିକାର'
-]
+)
 
 # Keywords for cybercrime (all cybercrime cases - victims, perpetrators, general questions)
-CYBERCRIME_KEYWORDS = [
+CYBERCRIME_KEYWORDS = (
     # General cybercrime terms
     'cybercrime', 'cyber crime', 'cyber law', 'cyber security', 'cyber attack', 'cyber offence',
     'cyber fraud', 'online fraud', 'digital fraud', 'internet fraud', 'computer crime',
@@ -194,9 +597,9 @@ CYBERCRIME_KEYWORDS = [
     # Odia
     'ସାଇବର ଅପରାଧ', 'ସାଇବର ଆଇନ', 'ଅନଲାଇନ୍ ଠକାମି', 'ସାଇବର ଅପରାଧର ବଳି',
     'ସାଇବର ଅପରାଧ ମାମଲା', 'ସାଇବର ଅପରାଧ ଅଭିଯୋଗ'
-]
+)
 
-FAMILY_KEYWORDS = [
+FAMILY_KEYWORDS = (
     'divorce', 'marriage', 'custody', 'alimony', 'maintenance', 'family', 'spouse', 'child',
     'तलाक', 'विवाह', 'संरक्षण', 'गुजारा भत्ता', 'परिवार', 'पति', 'पत्नी', 'बच्चा',
     'তালাক', 'বিবাহ', 'অভিভাবকত্ব', 'ভরণপোষণ', 'পরিবার', 'স্বামী', 'স্ত্রী', 'সন্তান',
@@ -208,9 +611,9 @@ FAMILY_KEYWORDS = [
     'ਤਲਾਕ', 'ਵਿਆਹ', 'ਸੰਭਾਲ', 'ਪਰਿਵਾਰ', 'ਪਤੀ', 'ਪਤਨੀ', 'ਬੱਚਾ',
     'ವಿವಾಹ ವಿಚ್ಛೇದನ', 'ವಿವಾಹ', 'ಸಂರಕ್ಷಣೆ', 'ಕುಟುಂಬ', 'ಪತಿ', 'ಪತ್ನಿ', 'ಮಗು',
     'ବିବାହ ବିଚ୍ଛେଦ', 'ବିବାହ', 'ସଂରକ୍ଷଣ', 'ପରିବାର', 'ପତି', 'ପତ୍ନୀ', 'ପିଲା'
-]
+)
 
-CONTRACT_KEYWORDS = [
+CONTRACT_KEYWORDS = (
     'contract', 'agreement', 'breach', 'damages', 'employment', 'job', 'work', 'salary',
     'अनुबंध', 'समझौता', 'उल्लंघन', 'नुकसान', 'रोजगार', 'नौकरी', 'काम', 'वेतन',
     'চুক্তি', 'লঙ্ঘন', 'ক্ষতি', 'চাকরি', 'কাজ', 'বেতন',
@@ -222,9 +625,9 @@ CONTRACT_KEYWORDS = [
     'ਸਮਝੌਤਾ', 'ਉਲੰਘਣ', 'ਨੁਕਸਾਨ', 'ਰੋਜ਼ਗਾਰ', 'ਨੌਕਰੀ', 'ਕੰਮ', 'ਤਨਖਾਹ',
     'ಒಪ್ಪಂದ', 'ಉಲ್ಲಂಘನೆ', 'ನಷ್ಟ', 'ಉದ್ಯೋಗ', 'ಕೆಲಸ', 'ಸಂಬಳ',
     'ଚୁକ୍ତି', 'ଉଲ୍ଲଂଘନ', 'କ୍ଷତି', 'ଚାକିରି', 'କାମ', 'ବେତନ'
-]
+)
 
-CONSUMER_KEYWORDS = [
+CONSUMER_KEYWORDS = (
     'consumer', 'refund', 'defective', 'warranty', 'product', 'service', 'purchase',
     'उपभोक्ता', 'वापसी', 'दोषपूर्ण', 'वारंटी', 'शिकायत', 'उत्पाद', 'सेवा', 'खरीद',
     'ভোক্তা', 'ফেরত', 'ত্রুটিপূর্ণ', 'ওয়ারেন্টি', 'অভিযোগ', 'পণ্য', 'সেবা', 'ক্রয়',
@@ -236,7 +639,7 @@ CONSUMER_KEYWORDS = [
     'ਗ੍ਰਾਹਕ', 'ਵਾਪਸੀ', 'ਦੋਸ਼ਪੂਰਨ', 'ਵਾਰੰਟੀ', 'ਸ਼ਿਕਾਇਤ', 'ਉਤਪਾਦ', 'ਸੇਵਾ', 'ਖਰੀਦ',
     'ಗ್ರಾಹಕ', 'ಹಿಂತಿರುಗಿಸುವಿಕೆ', 'ದೋಷಪೂರಿತ', 'ದೂರು', 'ಉತ್ಪನ್ನ', 'ಸೇವೆ', 'ಖರೀದಿ',
     'ଗ୍ରାହକ', 'ଫେରସ୍ତ', 'ଦୋଷପୂର୍ଣ୍ଣ', 'ଓାରାଣ୍ଟି', 'ଉତ୍ପାଦ', 'ସେବା', 'କ୍ରୟ'
-]
+)
 
 OFFLINE_RESPONSE_TEMPLATES = [
     (
@@ -441,93 +844,126 @@ DEFAULT_OFFLINE_RESPONSE = """**General Legal Guidance (India)**
 - District Legal Services Authority for Lok Adalat / mediation
 - Consumer Commissions, Family Courts, Cyber Police Stations"""
 
-
-def get_openai_answer(question: str, language: str = 'en', previous_cases: list[dict] = None) -> str:
-    """Get answer from OpenAI API with context from previous cases"""
-    try:
-        api_key = os.environ.get('OPENAI_API_KEY')
-        if not api_key:
-            return "OpenAI API key not set. Set OPENAI_API_KEY environment variable."
-
-        # Fetch relevant court cases from Indian court databases (not local SQLite)
-        # Only fetch if previous_cases is None AND question is legal (not identity/unrelated)
-        if previous_cases is None:
-            previous_cases = []
-            # Check if this is a legal question before fetching cases
+# Response bodies indexed like the templates, with the default last, plus their
+# translations per language (filled on first use; the texts never change).
+_OFFLINE_RESPONSES = tuple(template for _, template in OFFLINE_RESPONSE_TEMPLATES) + (DEFAULT_OFFLINE_RESPONSE,)
+_OFFLINE_TRANSLATIONS: List[Dict[str, str]] = [{} for _ in _OFFLINE_RESPONSES]
+
+# All template keywords in one automaton, so scoring a question is a single pass
+# over it instead of one substring scan per keyword. Each keyword maps to the
+# template indexes that list it (repeated once per listing, as the scores count).
+_OFFLINE_KEYWORD_AC = None
+if ahocorasick is not None:
+    _keyword_templates: Dict[str, List[int]] = {}
+    for _idx, (_keywords, _) in enumerate(OFFLINE_RESPONSE_TEMPLATES):
+        for _word in _keywords:
+            _keyword_templates.setdefault(_word, []).append(_idx)
+    _OFFLINE_KEYWORD_AC = ahocorasick.Automaton()
+    for _word, _idxs in _keyword_templates.items():
+        _OFFLINE_KEYWORD_AC.add_word(_word, (_word, tuple(_idxs)))
+    _OFFLINE_KEYWORD_AC.make_automaton()
+    _OFFLINE_KEYWORD_RE = None
+else:
+    # Without pyahocorasick, one alternation over every keyword tells in a single
+    # C-level scan whether any template can score; only then are keywords counted.
+    _OFFLINE_KEYWORD_RE = re.compile("|".join(
+        re.escape(word) for keywords, _ in OFFLINE_RESPONSE_TEMPLATES for word in keywords
+    ))
+
+
+def _score_offline_templates(question_lower: str) -> List[int]:
+    """Number of each template's keywords that occur in the question."""
+    if _OFFLINE_KEYWORD_AC is None:
+        if not _OFFLINE_KEYWORD_RE.search(question_lower):
+            return [0] * len(OFFLINE_RESPONSE_TEMPLATES)
+        return [
+            sum(1 for word in keywords if word in question_lower)
+            for keywords, _ in OFFLINE_RESPONSE_TEMPLATES
+        ]
+    scores = [0] * len(OFFLINE_RESPONSE_TEMPLATES)
+    matched = set()
+    for _, (word, idxs) in _OFFLINE_KEYWORD_AC.iter(question_lower):
+        if word in matched:
+            continue
+        matched.add(word)
+        for idx in idxs:
+            scores[idx] += 1
+    return scores
+
+
+def prewarm_translations() -> None:
+    """Translate the static prompt, fallback and offline texts for every mapped language.
+
+    Runs on one background thread, a language at a time, so start-up is not delayed and
+    Google Translate sees a trickle rather than a burst; with REDIS_URL set the results
+    are shared with every other worker.
+    """
+    def warm() -> None:
+        advisor = _advisor()
+        for language in _SUPPORTED_LANGUAGES:
+            if language == 'en':
+                continue
+            advisor.prefetch_openai_texts(language)
+            # The fallback and all offline templates go out in a few packed requests
+            advisor.prefetch_cached_texts(
+                [(advisor._fallback_cache, advisor.base_fallback_response)]
+                + list(zip(_OFFLINE_TRANSLATIONS, _OFFLINE_RESPONSES)),
+                language,
+            )
+
+    threading.Thread(target=warm, name='legal-translate-prewarm', daemon=True).start()
+
+
+def _openai_messages(question: str, language: str, previous_cases: Optional[list[dict]]) -> list[dict]:
+    """Build the chat-completions messages, fetching court cases when none are given."""
+    # Fetch relevant court cases from Indian court databases (not local SQLite)
+    # Only fetch if previous_cases is None AND question is legal (not identity/unrelated)
+    if previous_cases is None:
+        previous_cases = []
+        # Check if this is a legal question before fetching cases
+        try:
+            from policy import is_legal_question, is_identity_question
+            is_legal = is_legal_question(question)
+            is_identity = is_identity_question(question)
+            should_fetch_cases = is_legal and not is_identity
+        except Exception:
+            # If policy functions not available, default to fetching (backward compatibility)
+            should_fetch_cases = True
+        
+        if should_fetch_cases:
             try:
-                from policy import is_legal_question, is_identity_question
-                is_legal = is_legal_question(question)
-                is_identity = is_identity_question(question)
-                should_fetch_cases = is_legal and not is_identity
-            except Exception:
-                # If policy functions not available, default to fetching (backward compatibility)
-                should_fetch_cases = True
-            
-            if should_fetch_cases:
-                try:
-                    # Search for relevant cases from Indian courts using RSS feeds
-                    if requests is not None:
-                        try:
-                            # Use RSS feeds from Indian Kanoon
-                            from app import _parse_rss_feed
-                            rss_feeds = [
-                                'https://indiankanoon.org/feeds/sc.rss',  # Supreme Court
-                                'https://indiankanoon.org/feeds/hc.rss',  # High Courts
-                            ]
-                            
-                            for feed_url in rss_feeds[:2]:  # Limit to 2 feeds
-                                try:
-                                    feed_results = _parse_rss_feed(feed_url, limit=3)
-                                    for item in feed_results:
-                                        previous_cases.append({
-                                            'title': item.get('title', ''),
-                                            'court': item.get('court', ''),
-                                            'date': item.get('date', ''),
-                                            'citation': item.get('citation', ''),
-                                            'url': item.get('url', ''),
-                                            'summary': item.get('summary', '')
-                                        })
-                                        if len(previous_cases) >= 5:
-                                            break
+                # Search for relevant cases from Indian courts using RSS feeds
+                if requests is not None:
+                    try:
+                        # Use RSS feeds from Indian Kanoon
+                        from app import _parse_rss_feed
+                        rss_feeds = [
+                            'https://indiankanoon.org/feeds/sc.rss',  # Supreme Court
+                            'https://indiankanoon.org/feeds/hc.rss',  # High Courts
+                        ]
+                        
+                        for feed_url in rss_feeds[:2]:  # Limit to 2 feeds
+                            try:
+                                feed_results = _parse_rss_feed(feed_url, limit=3)
+                                for item in feed_results:
+                                    previous_cases.append({
+                                        'title': item.get('title', ''),
+                                        'court': item.get('court', ''),
+                                        'date': item.get('date', ''),
+                                        'citation': item.get('citation', ''),
+                                        'url': item.get('url', ''),
+                                        'summary': item.get('summary', '')
+                                    })
                                     if len(previous_cases) >= 5:
                                         break
-                                except Exception as feed_err:
-                                    try:
-                                        from app import logger
-                                        logger.debug(f"RSS feed {feed_url} failed: {feed_err}")
-                                    except Exception:
-                                        pass
-                                    continue
-                            
-                            # If RSS feeds didn't return enough results, fallback to DuckDuckGo
-                            if len(previous_cases) < 3:
-                                try:
-                                    from app import _duckduckgo_search_official
-                                    results = _duckduckgo_search_official(question, limit=5)
-                                    for item in results:
-                                        previous_cases.append({
-                                            'title': item.get('title', ''),
-                                            'court': item.get('court', ''),
-                                            'date': item.get('date', ''),
-                                            'citation': item.get('citation', ''),
-                                            'url': item.get('url', ''),
-                                            'summary': item.get('snippet', '')
-                                        })
-                                        if len(previous_cases) >= 5:
-                                            break
-                                except Exception as ddg_err:
-                                    try:
-                                        from app import logger
-                                        logger.warning(f"DuckDuckGo fallback also failed: {ddg_err}")
-                                    except Exception:
-                                        pass
-                        except Exception as rss_err:
-                            try:
-                                from app import logger
-                                logger.info(f"RSS feed search failed: {rss_err}")
-                            except Exception:
-                                pass
-                            # Fallback to DuckDuckGo if RSS fails
+                                if len(previous_cases) >= 5:
+                                    break
+                            except Exception as feed_err:
+                                logger.debug(f"RSS feed {feed_url} failed: {feed_err}")
+                                continue
+                        
+                        # If RSS feeds didn't return enough results, fallback to DuckDuckGo
+                        if len(previous_cases) < 3:
                             try:
                                 from app import _duckduckgo_search_official
                                 results = _duckduckgo_search_official(question, limit=5)
@@ -540,14 +976,13 @@ def get_openai_answer(question: str, language: str = 'en', previous_cases: list[
                                         'url': item.get('url', ''),
                                         'summary': item.get('snippet', '')
                                     })
+                                    if len(previous_cases) >= 5:
+                                        break
                             except Exception as ddg_err:
-                                try:
-                                    from app import logger
-                                    logger.warning(f"DuckDuckGo search failed: {ddg_err}")
-                                except Exception:
-                                    pass
-                    else:
-                        # Fallback to DuckDuckGo if requests not available
+                                logger.warning(f"DuckDuckGo fallback also failed: {ddg_err}")
+                    except Exception as rss_err:
+                        logger.info(f"RSS feed search failed: {rss_err}")
+                        # Fallback to DuckDuckGo if RSS fails
                         try:
                             from app import _duckduckgo_search_official
                             results = _duckduckgo_search_official(question, limit=5)
@@ -561,233 +996,186 @@ def get_openai_answer(question: str, language: str = 'en', previous_cases: list[
                                     'summary': item.get('snippet', '')
                                 })
                         except Exception as ddg_err:
-                            try:
-                                from app import logger
-                                logger.warning(f"DuckDuckGo search failed: {ddg_err}")
-                            except Exception:
-                                pass
-                except Exception as e:
+                            logger.warning(f"DuckDuckGo search failed: {ddg_err}")
+                else:
+                    # Fallback to DuckDuckGo if requests not available
                     try:
-                        from app import logger
-                        logger.warning(f"Failed to fetch court cases: {e}")
-                    except Exception:
-                        pass
-
-        # Build context from previous court cases
-        cases_context = ""
-        if previous_cases:
-            cases_context = "\n\n**Relevant Indian Court Cases (from Indian court databases):**\n"
-            for idx, case in enumerate(previous_cases, 1):
-                cases_context += f"\n**Case {idx}:**\n"
-                if case.get('title'):
-                    cases_context += f"- **Title:** {case.get('title')}\n"
-                if case.get('court'):
-                    cases_context += f"- **Court:** {case.get('court')}\n"
-                if case.get('date'):
-                    cases_context += f"- **Date:** {case.get('date')}\n"
-                if case.get('citation'):
-                    cases_context += f"- **Citation:** {case.get('citation')}\n"
-                if case.get('summary'):
-                    cases_context += f"- **Summary:** {case.get('summary')}\n"
-                if case.get('url'):
-                    cases_context += f"- **Link:** {case.get('url')}\n"
-            cases_context += "\n**IMPORTANT:** Reference these court cases in your answer. Include relevant case citations and explain how these precedents relate to the user's question. Format your answer in clear points, mentioning specific cases where relevant.\n"
-
-        # Get legal prompt
-        legal_prompt = legal_advisor.get_legal_prompt(question, language)
-
-        # Use translated instruction based on the language
-        base_instruction = """You are a helpful legal AI for Indian law. Answer clearly and practically in POINT FORMAT (use bullet points or numbered lists). Always reference current Indian legal framework (BNS, BNSS, BSA instead of IPC, CrPC, Evidence Act). Cite specific laws and sections. If unsure, advise consulting a qualified lawyer.
+                        from app import _duckduckgo_search_official
+                        results = _duckduckgo_search_official(question, limit=5)
+                        for item in results:
+                            previous_cases.append({
+                                'title': item.get('title', ''),
+                                'court': item.get('court', ''),
+                                'date': item.get('date', ''),
+                                'citation': item.get('citation', ''),
+                                'url': item.get('url', ''),
+                                'summary': item.get('snippet', '')
+                            })
+                    except Exception as ddg_err:
+                        logger.warning(f"DuckDuckGo search failed: {ddg_err}")
+            except Exception as e:
+                logger.warning(f"Failed to fetch court cases: {e}")
+
+    # Build context from previous court cases
+    cases_context = ""
+    if previous_cases:
+        cases_context = "\n\n**Relevant Indian Court Cases (from Indian court databases):**\n"
+        for idx, case in enumerate(previous_cases, 1):
+            cases_context += f"\n**Case {idx}:**\n"
+            if case.get('title'):
+                cases_context += f"- **Title:** {case.get('title')}\n"
+            if case.get('court'):
+                cases_context += f"- **Court:** {case.get('court')}\n"
+            if case.get('date'):
+                cases_context += f"- **Date:** {case.get('date')}\n"
+            if case.get('citation'):
+                cases_context += f"- **Citation:** {case.get('citation')}\n"
+            if case.get('summary'):
+                cases_context += f"- **Summary:** {case.get('summary')}\n"
+            if case.get('url'):
+                cases_context += f"- **Link:** {case.get('url')}\n"
+        cases_context += "\n**IMPORTANT:** Reference these court cases in your answer. Include relevant case citations and explain how these precedents relate to the user's question. Format your answer in clear points, mentioning specific cases where relevant.\n"
+
+    # Get legal prompt
+    advisor = _advisor()
+    advisor.prefetch_openai_texts(language)
+    legal_prompt = advisor.get_legal_prompt(question, language)
+
+    instruction = advisor.get_translated_instruction(language)
+
+    # The instruction goes in the system message only; repeating it in the user
+    # message doubled its tokens on every call without adding information.
+    full_prompt = (cases_context.strip() + "\n\n" + legal_prompt) if cases_context else legal_prompt
+    return [
+        {"role": "system", "content": instruction},
+        {"role": "user", "content": full_prompt},
+    ]
+
+
+def _openai_timeout() -> tuple:
+    """(connect, read) timeout; the read part is configurable via OPENAI_TIMEOUT."""
+    try:
+        read_timeout = float(os.environ.get('OPENAI_TIMEOUT', _OPENAI_READ_TIMEOUT))
+    except ValueError:
+        read_timeout = _OPENAI_READ_TIMEOUT
+    return (_OPENAI_CONNECT_TIMEOUT, read_timeout)
+
+
+def _answer_cache_key(question: str, language: str, model: str, previous_cases: Optional[list[dict]]):
+    """Key for _ANSWER_CACHE, or None when the question has no words."""
+    words = _QUESTION_WORD_RE.findall(question.lower())
+    if not words:
+        return None
+    # The supplied cases shape the answer; None means they are fetched per question.
+    cases = None if previous_cases is None else tuple(
+        case.get('url') or case.get('title') or '' for case in previous_cases
+    )
+    digest = hashlib.blake2b(repr((" ".join(words), cases)).encode('utf-8'), digest_size=16).digest()
+    return (model, language, digest)
 
-FORMATTING REQUIREMENTS:
-- Always format answers as bullet points (-) or numbered points (1., 2., 3.)
-- Use bold (**text**) for emphasis on important terms, laws, or sections
-- Use headers (##) for major sections
-- Keep each point concise and clear
-- Organize information in logical sections with clear headers
-- NEVER write long paragraphs. Always break information into points.
 
-When answering questions, you have access to previous court cases and their results. Use this information to:
-1. Reference similar cases and their outcomes
-2. Provide context about how similar situations were handled
-3. Explain patterns or precedents from previous cases
-4. Help users understand what to expect based on similar cases
+def get_openai_answer(question: str, language: str = 'en', previous_cases: list[dict] = None) -> str:
+    """Get answer from OpenAI API with context from previous cases"""
+    try:
+        _load_env()
+        api_key = os.environ.get('OPENAI_API_KEY')
+        if not api_key:
+            return "OpenAI API key not set. Set OPENAI_API_KEY environment variable."
+        model = os.environ.get('OPENAI_MODEL', 'gpt-4o-mini')
 
-Always prioritize accuracy and cite specific laws and sections. Format everything in clear, organized points.
-IMPORTANT: You must respond in the same language as this instruction. All your responses must be written entirely in the language of this instruction."""
-        
-        instruction = legal_advisor.translate_text(base_instruction, language)
+        # A key/model pair OpenAI just rejected will be rejected again; skip the case
+        # lookups and the round-trip until the cool-down passes.
+        config_key = (hashlib.blake2b(api_key.encode('utf-8'), digest_size=8).digest(), model)
+        if _REJECTED_CONFIGS.get(config_key, 0) > time.monotonic():
+            return _advisor().get_fallback_response(language)
+
+        cache_key = _answer_cache_key(question, language, model, previous_cases)
+        if cache_key is not None:
+            with _ANSWER_CACHE_LOCK:
+                cached = _ANSWER_CACHE.get(cache_key)
+            if cached is not None:
+                return cached
 
-        # Combine instruction, cases context, and legal prompt
-        full_prompt = instruction + cases_context + "\n\n" + legal_prompt
+        messages = _openai_messages(question, language, previous_cases)
 
         # OpenAI API call
-        model = os.environ.get('OPENAI_MODEL', 'gpt-4o-mini')
         api_url = "https://api.openai.com/v1/chat/completions"
+        # Fail fast on an unreachable host; the read timeout covers the whole
+        # (non-streamed) completion, so it stays generous and configurable.
+        timeout = _openai_timeout()
         
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {api_key}"
-        }
+        headers = {"Authorization": f"Bearer {api_key}"}
 
         payload = {
             "model": model,
-            "messages": [
-                {
-                    "role": "system",
-                    "content": instruction
-                },
-                {
-                    "role": "user",
-                    "content": full_prompt
-                }
-            ],
+            "messages": messages,
             "temperature": 0.7,
             "max_tokens": 2000
         }
 
-        response = requests.post(api_url, headers=headers, json=payload, timeout=30)
+        gate = _openai_gate()
+        if not gate.acquire():
+            logger.warning("OpenAI call limit reached; answering offline")
+            return _advisor().get_fallback_response(language)
+        try:
+            if orjson is not None:
+                response = _SESSION.post(api_url, headers=headers, data=orjson.dumps(payload), timeout=timeout)
+            else:
+                response = _SESSION.post(api_url, headers=headers, json=payload, timeout=timeout)
+        finally:
+            gate.release()
         
         if response.status_code == 200:
-            data = response.json()
-            try:
-                choices = data.get("choices", [])
-                if choices and len(choices) > 0:
-                    text = choices[0].get("message", {}).get("content", "").strip()
-                    if text:
-                        return text
-            except Exception as e:
-                try:
-                    from app import logger
-                    logger.error(f"Error parsing OpenAI response: {e}")
-                except Exception:
-                    pass
+            data = orjson.loads(response.content) if orjson is not None else response.json()
+            # Navigate with .get() so an odd payload (null content, no choices) falls
+            # through to the fallback without raising.
+            choices = (data.get("choices") if isinstance(data, dict) else None) or []
+            first = choices[0] if choices and isinstance(choices[0], dict) else {}
+            message = first.get("message") or {}
+            text = (message.get("content") or "").strip()
+            if text:
+                if cache_key is not None:
+                    with _ANSWER_CACHE_LOCK:
+                        _ANSWER_CACHE[cache_key] = text
+                return text
+            logger.debug("OpenAI response had no answer text")
         else:
+            if response.status_code in (401, 403, 404):
+                _REJECTED_CONFIGS[config_key] = time.monotonic() + _REJECTED_CONFIG_TTL
             error_text = f"{response.status_code}: {response.text}"
-            try:
-                from app import logger
-                logger.error(f"OpenAI API error: {error_text}")
-            except Exception:
-                pass
+            logger.error(f"OpenAI API error: {error_text}")
 
-        return legal_advisor.get_fallback_response(language)
+        return _advisor().get_fallback_response(language)
 
     except Exception as e:
-        try:
-            from app import logger
-            logger.error(f"OpenAI API error: {str(e)}")
-        except Exception:
-            pass
-        return legal_advisor.get_fallback_response(language)
+        logger.error(f"OpenAI API error: {str(e)}")
+        return _advisor().get_fallback_response(language)
 
  
 
  
 
-def get_fallback_legal_response(question: str) -> str:
-    """Provide a fallback legal response when API is not available"""
-    question_lower = question.lower()
-    
-    # Simple keyword-based responses
-    if any(word in question_lower for word in ['tenant', 'rent', 'eviction', 'landlord']):
-        return """As a tenant, you have several important rights under Indian law:
+def get_model_answer(question: str, language: str = 'en', previous_cases: list[dict] = None) -> Optional[str]:
+    """The OpenAI answer to question, or None when no real model answer was obtained.
 
-1. **Right to peaceful enjoyment**: Your landlord cannot disturb your peaceful possession of the property.
-
-2. **Right to notice**: For eviction, landlords must provide proper notice as per state laws.
-
-3. **Right to essential services**: Landlords must maintain essential services like water, electricity.
-
-4. **Right to privacy**: Landlords cannot enter your premises without notice.
-
-5. **Protection against arbitrary rent increases**: Rent increases must follow legal procedures.
-
-Please note: Laws vary by state. For specific situations, consult a local lawyer."""
-
-    elif any(word in question_lower for word in ['fir', 'police', 'complaint', 'crime']):
-        return """For filing an FIR (First Information Report) in India:
-
-1. **Go to the nearest police station** where the incident occurred.
-
-2. **Provide detailed information** about the incident, including:
-   - Date, time, and location
-   - Description of what happened
-   - Names of people involved
-   - Any evidence or witnesses
-
-3. **Get acknowledgment**: The police must give you a copy of the FIR.
-
-4. **Follow up**: Keep track of the investigation progress.
-
-5. **Legal remedies**: If police refuse to file FIR, you can approach the Superintendent of Police or file a complaint with the Magistrate.
-
-**Legal Framework**: This process is governed by the Bharatiya Nagarik Suraksha Sanhita (BNSS), 2023, which replaced the Code of Criminal Procedure (CrPC).
-
-Remember: FIR is your right for cognizable offenses. Don't hesitate to seek legal help if needed."""
-
-    elif any(word in question_lower for word in ['divorce', 'marriage', 'custody', 'alimony']):
-        return """For family law matters in India:
-
-**Divorce Process:**
-1. **Grounds for divorce**: Adultery, cruelty, desertion, conversion, mental disorder, etc.
-2. **Mutual consent**: Both parties can file for divorce by mutual consent.
-3. **Court procedures**: File petition in family court with proper documentation.
-
-**Child Custody:**
-1. **Best interest of child**: Courts prioritize child's welfare.
-2. **Joint custody**: Both parents can share custody.
-3. **Visitation rights**: Non-custodial parent has visitation rights.
-
-**Important**: Family law is complex and varies by personal laws (Hindu, Muslim, Christian, etc.). Consult a family lawyer for specific advice."""
-
-    elif any(word in question_lower for word in ['contract', 'agreement', 'breach', 'damages']):
-        return """For contract-related issues in India:
-
-**Essential Elements of a Valid Contract:**
-1. **Offer and acceptance**
-2. **Consideration** (something of value)
-3. **Competent parties**
-4. **Free consent**
-5. **Lawful object**
-
-**Breach of Contract Remedies:**
-1. **Specific performance**: Court can order performance of contract
-2. **Damages**: Monetary compensation for losses
-3. **Injunction**: Court order to stop certain actions
-4. **Rescission**: Cancellation of contract
-
-**Important**: Contract law is governed by the Indian Contract Act, 1872. For complex matters, consult a contract lawyer."""
-
-    else:
-        return """I understand you're seeking legal advice. Here's some general guidance:
-
-**General Legal Rights in India:**
-1. **Right to legal aid**: Free legal aid is available for those who cannot afford lawyers
-2. **Right to fair trial**: Everyone has the right to a fair and speedy trial
-3. **Right to legal representation**: You have the right to be represented by a lawyer
-4. **Right to information**: You can access public information under RTI Act
-
-**Important Disclaimer**: 
-- This is general information only
-- Laws vary by state and personal circumstances
-- Always consult a qualified lawyer for specific legal advice
-- For urgent matters, contact legal aid services immediately
-
-**Emergency Contacts:**
-- Legal Aid: 1800-345-6789
-- Women Helpline: 181
-- Child Helpline: 1098"""
-
-def get_legal_advice(question: str, language: str = 'en', previous_cases: list[dict] = None) -> str:
-    """Main function to get legal advice using OpenAI first, then fallback"""
-    if not question or not question.strip():
-        base_message = "Could you please provide a question that addresses a specific legal issue."
-        return legal_advisor.translate_text(base_message, language)
+    None covers a missing key, a failed or rate-limited call and the canned fallback
+    text, so callers can tell a model answer from offline text (e.g. before caching it).
+    """
+    # Without a key the OpenAI path cannot answer; don't translate the fallback text first.
+    _load_env()
+    if not os.environ.get('OPENAI_API_KEY'):
+        return None
     
     try:
+        # The translated fallback text is needed to vet the answer either way; fetch it
+        # while the OpenAI call is in flight instead of after it.
+        fallback_future = None
+        if language != 'en':
+            fallback_future = _TRANSLATION_POOL.submit(_advisor().get_fallback_response, language)
         # Try OpenAI first with language-specific prompt and previous cases context
         openai_answer = get_openai_answer(question.strip(), language, previous_cases)
-        fallback_signature = legal_advisor.get_fallback_response(language).strip().lower()
+        fallback_response = fallback_future.result() if fallback_future else _advisor().get_fallback_response(language)
+        fallback_signature = fallback_response.strip().lower()
         normalized_answer = (openai_answer or '').strip()
         lower_answer = normalized_answer.lower()
         if (
@@ -797,42 +1185,42 @@ def get_legal_advice(question: str, language: str = 'en', previous_cases: list[d
             and lower_answer != fallback_signature
         ):
             # If OpenAI returns answer in English but we need another language, translate it
-            if language != 'en' and normalized_answer == legal_advisor.get_fallback_response('en'):
-                return legal_advisor.translate_text(normalized_answer, language)
+            if language != 'en' and normalized_answer == _advisor().get_fallback_response('en'):
+                return _advisor().translate_text(normalized_answer, language)
             return normalized_answer
+        return None
 
-        # Fallback to intelligent response
-        return get_intelligent_legal_response(question, language)
-        
     except Exception:
-        # Fallback to intelligent response
-        return get_intelligent_legal_response(question, language)
+        return None
+
+def get_legal_advice(question: str, language: str = 'en', previous_cases: list[dict] = None) -> str:
+    """Main function to get legal advice using OpenAI first, then fallback"""
+    if not question or not question.strip():
+        base_message = "Could you please provide a question that addresses a specific legal issue."
+        return _advisor().translate_text(base_message, language)
+
+    answer = get_model_answer(question, language, previous_cases)
+    if answer:
+        return answer
+    # Fallback to intelligent response
+    return get_intelligent_legal_response(question, language)
 
 def get_intelligent_legal_response(question: str, language: str = 'en') -> str:
     """Provide intelligent legal responses using curated templates with priority-based matching."""
     question_lower = (question or '').lower()
 
-    # Use priority-based matching: more specific keywords should match first
-    # Calculate match scores for each template (number of matching keywords)
-    scored_templates = []
-    for keywords, template in OFFLINE_RESPONSE_TEMPLATES:
-        matches = sum(1 for word in keywords if word in question_lower)
-        if matches > 0:
-            scored_templates.append((matches, template))
-    
-    # Sort by match count (descending) to prioritize templates with more keyword matches
-    scored_templates.sort(key=lambda x: x[0], reverse=True)
-    
-    # Use the template with the highest match score
-    response = None
-    if scored_templates:
-        response = scored_templates[0][1]
-    else:
-        response = DEFAULT_OFFLINE_RESPONSE
+    # Use priority-based matching: the template with the most keyword matches wins,
+    # ties going to the earlier (more specific) template
+    best_idx = len(OFFLINE_RESPONSE_TEMPLATES)  # DEFAULT_OFFLINE_RESPONSE
+    best = 0
+    for idx, score in enumerate(_score_offline_templates(question_lower)):
+        if score > best:
+            best, best_idx = score, idx
+    response = _OFFLINE_RESPONSES[best_idx]
 
     if language != 'en':
         try:
-            return legal_advisor.translate_text(response, language)
+            return _advisor()._translate_cached(_OFFLINE_TRANSLATIONS[best_idx], response, language)
         except Exception:
             return response
     return response
@@ -0,0 +1,205 @@
+import sys
+import os
+import tempfile
+# Add backend folder to sys.path so we can import app directly
+BACKEND_DIR = os.path.abspath(os.path.dirname(__file__))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+# The database path is read when utils.db is imported; point it at a scratch file first.
+_DB_DIR = tempfile.mkdtemp(prefix='nyaysetu-test-')
+os.environ['NYAYSETU_DB_PATH'] = os.path.join(_DB_DIR, 'test.db')
+
+import sqlite3
+
+import pytest
+
+import app as app_module
+from utils import db
+
+
+@pytest.fixture
+def client():
+    return app_module.app.test_client()
+
+
+def _add_chat(question, timestamp, language='en'):
+    return db.insert_chat(question=question, answer='answer', language=language, timestamp=timestamp)
+
+
+def test_chats_etag_revalidates_until_a_write(client):
+    _add_chat('etag question', '2030-01-01T00:00:00')
+    first = client.get('/data/chats?q=etag')
+    etag = first.headers['ETag']
+    assert client.get('/data/chats?q=etag', headers={'If-None-Match': etag}).status_code == 304
+
+    # Editing an older row keeps count and newest timestamp the same but must change the ETag
+    conn = db.get_db_connection()
+    conn.execute("UPDATE chats SET answer = 'edited' WHERE question = 'etag question'")
+    second = client.get('/data/chats?q=etag', headers={'If-None-Match': etag})
+    assert second.status_code == 200
+    assert second.get_json()['chats'][0]['answer'] == 'edited'
+
+
+def test_chats_etag_depends_on_query(client):
+    _add_chat('filter question', '2030-01-02T00:00:00')
+    all_chats = client.get('/data/chats').headers['ETag']
+    filtered = client.get('/data/chats?language=hi').headers['ETag']
+    paged = client.get('/data/chats?limit=1').headers['ETag']
+    assert len({all_chats, filtered, paged}) == 3
+
+
+def test_listing_query_errors_raise_before_streaming():
+    empty_db = os.path.join(_DB_DIR, 'empty.db')
+    with pytest.raises(sqlite3.OperationalError):
+        db.iter_chats_filtered(db_path=empty_db)
+    with pytest.raises(sqlite3.OperationalError):
+        db.iter_forms_filtered(db_path=empty_db)
+
+
+def test_register_clears_cached_login_miss(client):
+    creds = {'email': 'late.signup@example.com', 'password': 'secret1'}
+    assert client.post('/auth/login', json=creds).status_code == 401
+    assert 'late.signup@example.com' in app_module._LOGIN_MISS_CACHE
+
+    assert client.post('/auth/register', json=creds).status_code == 201
+    assert client.post('/auth/login', json=creds).status_code == 200
+
+
+def test_new_passwords_use_argon2_and_legacy_hashes_still_verify():
+    if app_module._password_hasher is None:
+        pytest.skip('argon2-cffi not installed')
+    new_hash = app_module.hash_password('secret1')
+    assert new_hash.startswith('$argon2')
+    assert app_module.verify_password('secret1', new_hash)
+    assert not app_module.verify_password('wrong', new_hash)
+
+    from werkzeug.security import generate_password_hash
+    legacy = generate_password_hash('secret1')
+    assert app_module.verify_password('secret1', legacy)
+    assert not app_module.verify_password('wrong', legacy)
+
+
+def test_legacy_hash_login(client):
+    from werkzeug.security import generate_password_hash
+    db.create_user('legacy@example.com', generate_password_hash('secret1'), None,
+                   '2024-01-01T00:00:00', is_verified=1, verified_at='2024-01-01T00:00:00')
+    creds = {'email': 'legacy@example.com', 'password': 'secret1'}
+    assert client.post('/auth/login', json=creds).status_code == 200
+    assert client.post('/auth/login', json={**creds, 'password': 'nope12'}).status_code == 401
+
+
+@pytest.fixture(params=['hyperscan', 'ahocorasick', 'plain'])
+def indicator_path(request, monkeypatch):
+    """Run the legal-indicator counter through each of its three matching paths."""
+    if request.param == 'hyperscan' and app_module._LEGAL_HS is None:
+        pytest.skip('hyperscan not installed')
+    if request.param == 'ahocorasick' and app_module._LEGAL_AC is None:
+        pytest.skip('pyahocorasick not installed')
+    if request.param != 'hyperscan':
+        monkeypatch.setattr(app_module, '_LEGAL_HS', None)
+    if request.param == 'plain':
+        monkeypatch.setattr(app_module, '_LEGAL_AC', None)
+    return request.param
+
+
+def test_legal_indicators_match_whole_words_only(indicator_path):
+    count = app_module._count_legal_indicators
+    # 'act' inside 'contract'/'enact', 'law' inside 'lawn', 'fir' inside 'first'
+    assert count('We enact a lawn first, then others', 10) == 0
+    assert count('The contract was breached', 10) == 1
+    assert count('Court, judge & LAW: an FIR (fir) under the IT Act.', 10) == 6
+    assert count('Charge sheet filed; chargesheets are different', 10) == 1
+
+
+def test_legal_indicator_count_stops_at_limit(indicator_path):
+    text = 'court judge law legal statute act section clause plaintiff defendant'
+    assert app_module._count_legal_indicators(text, 5) == 5
+
+
+class _FakeJob:
+    id = 'job-123'
+
+
+class _FakeResult:
+    status = 'SUCCESS'
+    result = {'summary': 'done'}
+
+    def failed(self):
+        return False
+
+    def successful(self):
+        return True
+
+
+class _FakeCelery:
+    class conf:
+        result_expires = 3600
+
+    def AsyncResult(self, job_id):
+        return _FakeResult()
+
+
+class _FakeTask:
+    @staticmethod
+    def delay(*args):
+        return _FakeJob()
+
+
+def _token(client, email):
+    creds = {'email': email, 'password': 'secret1'}
+    client.post('/auth/register', json=creds)
+    return {'Authorization': 'Bearer ' + client.post('/auth/login', json=creds).get_json()['token']}
+
+
+def test_job_status_is_only_visible_to_its_owner(client, monkeypatch):
+    import io
+    monkeypatch.setattr(app_module, 'celery_app', _FakeCelery())
+    monkeypatch.setattr(app_module, 'summarize_pdf_task', _FakeTask, raising=False)
+    owner = _token(client, 'job.owner@example.com')
+    other = _token(client, 'job.other@example.com')
+
+    pdf = client.post('/tools/convert_to_pdf', headers=owner,
+                      json={'text': 'The court granted bail under section 437.', 'title': 'Order'}).data
+    started = client.post('/tools/summarize_pdf?async=1', headers=owner,
+                          data={'file': (io.BytesIO(pdf), 'order.pdf')}, content_type='multipart/form-data')
+    assert started.status_code == 202
+    job_id = started.get_json()['job_id']
+
+    assert client.get(f'/jobs/{job_id}', headers=owner).get_json()['result'] == {'summary': 'done'}
+    assert client.get(f'/jobs/{job_id}', headers=other).status_code == 404
+    assert client.get('/jobs/unknown-job', headers=owner).status_code == 404
+
+
+_LONG_DOCUMENT = ('The petitioner filed a writ under Article 226 before the High Court. ' * 20).strip()
+
+
+def test_offline_answer_is_not_cached_as_summary(monkeypatch):
+    monkeypatch.setattr(app_module, 'get_model_answer', lambda prompt, language: None)
+    summary = app_module.generate_legal_summary(_LONG_DOCUMENT, True)
+    assert summary == app_module.generate_basic_summary(_LONG_DOCUMENT)
+
+    # Once the model is back, its answer is used (nothing stale was cached) and then cached
+    calls = []
+    monkeypatch.setattr(app_module, 'get_model_answer',
+                        lambda prompt, language: calls.append(prompt) or 'Model summary')
+    assert app_module.generate_legal_summary(_LONG_DOCUMENT, True) == 'Model summary'
+    assert app_module.generate_legal_summary(_LONG_DOCUMENT, True) == 'Model summary'
+    assert len(calls) == 1
+
+
+def test_pdf_upload_caches_only_model_summaries(client, monkeypatch):
+    import io
+    headers = _token(client, 'pdf.uploader@example.com')
+    pdf = client.post('/tools/convert_to_pdf', headers=headers,
+                      json={'text': _LONG_DOCUMENT, 'title': 'Writ'}).data
+
+    def upload():
+        return client.post('/tools/summarize_pdf', headers=headers,
+                           data={'file': (io.BytesIO(pdf), 'writ.pdf')},
+                           content_type='multipart/form-data').get_json()['summary']
+
+    monkeypatch.setattr(app_module, 'get_model_answer', lambda prompt, language: None)
+    assert upload() != 'Recovered summary'
+    monkeypatch.setattr(app_module, 'get_model_answer', lambda prompt, language: 'Recovered summary')
+    assert upload() == 'Recovered summary'
@@ -0,0 +1,87 @@
+import sys
+import os
+import tempfile
+# Add backend folder to sys.path so we can import utils directly
+BACKEND_DIR = os.path.abspath(os.path.dirname(__file__))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+import pytest
+
+from utils import db
+
+
+@pytest.fixture
+def db_path():
+    path = os.path.join(tempfile.mkdtemp(prefix='nyaysetu-db-test-'), 'test.db')
+    db.init_db(path)
+    return path
+
+
+def _ids(rows):
+    return [row['id'] for row in rows]
+
+
+def test_chats_keyset_pagination_walks_listing_order(db_path):
+    # Two rows share a timestamp so the id tie-break is exercised
+    stamps = ['2030-01-01', '2030-01-03', '2030-01-02', '2030-01-03', '2030-01-04']
+    for i, ts in enumerate(stamps):
+        db.insert_chat(f'question {i}', 'answer', 'en', ts, db_path=db_path)
+    full = _ids(db.fetch_chats_filtered(db_path=db_path))
+
+    pages, after = [], None
+    while True:
+        page = db.fetch_chats_filtered(db_path=db_path, limit=2, after=after)
+        if not page:
+            break
+        pages.extend(_ids(page))
+        after = page[-1]['id']
+    assert pages == full
+    assert len(full) == len(set(full)) == len(stamps)
+
+
+def test_keyset_pagination_keeps_filters(db_path):
+    for i in range(4):
+        db.insert_chat(f'question {i}', 'answer', 'hi' if i % 2 else 'en', f'2030-01-0{i + 1}', db_path=db_path)
+    first = db.fetch_chats_filtered(language='hi', db_path=db_path, limit=1)
+    rest = db.fetch_chats_filtered(language='hi', db_path=db_path, after=first[0]['id'])
+    assert [row['language'] for row in first + rest] == ['hi', 'hi']
+
+
+def test_forms_keyset_pagination(db_path):
+    for i in range(3):
+        db.insert_form(f'T{i}', 'text', {'n': i}, f'2030-01-0{i + 1}', db_path=db_path)
+    first = db.fetch_forms_filtered(db_path=db_path, limit=1)
+    rest = db.fetch_forms_filtered(db_path=db_path, after=first[0]['id'])
+    assert [row['form_type'] for row in first + rest] == ['T2', 'T1', 'T0']
+    assert rest[0]['responses'] == {'n': 1}
+
+
+def test_unknown_after_id_returns_no_rows(db_path):
+    db.insert_chat('question', 'answer', 'en', '2030-01-01', db_path=db_path)
+    assert db.fetch_chats_filtered(db_path=db_path, after=999999) == []
+
+
+def test_table_version_bumps_on_every_write(db_path):
+    start = db.get_table_version('chats', db_path=db_path)
+    chat_id = db.insert_chat('question', 'answer', 'en', '2030-01-01', db_path=db_path)
+    conn = db.get_db_connection(db_path)
+    conn.execute("UPDATE chats SET answer = 'edited' WHERE id = ?", (chat_id,))
+    conn.execute("DELETE FROM chats WHERE id = ?", (chat_id,))
+    assert db.get_table_version('chats', db_path=db_path) == start + 3
+    assert db.get_table_version('forms', db_path=db_path) == 0
+    with pytest.raises(ValueError):
+        db.get_table_version('users', db_path=db_path)
+
+
+def test_closed_connection_is_replaced(db_path):
+    conn = db.get_db_connection(db_path)
+    assert db.get_db_connection(db_path) is conn
+    conn.close()
+    db.insert_chat('question', 'answer', 'en', '2030-01-01', db_path=db_path)
+    assert len(db.fetch_chats_filtered(db_path=db_path)) == 1
+
+
+def test_init_db_leaves_no_open_transaction(db_path):
+    db.init_db(db_path)
+    assert not db.get_db_connection(db_path).in_transaction
@@ -0,0 +1,88 @@
+import sys
+import os
+# Add backend folder to sys.path so we can import the models package directly
+BACKEND_DIR = os.path.abspath(os.path.dirname(__file__))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+import pytest
+
+from models import legal_chat_model
+
+
+class FakeTranslator:
+    """Stands in for GoogleTranslator: marks text as translated, fails on request."""
+
+    fail_on = None
+    calls = []
+
+    def __init__(self, source, target):
+        self.target = target
+
+    def translate(self, text):
+        FakeTranslator.calls.append(text)
+        if FakeTranslator.fail_on and FakeTranslator.fail_on in text:
+            raise RuntimeError('network blip')
+        return f'<{self.target}>{text}'
+
+
+@pytest.fixture
+def advisor(monkeypatch):
+    FakeTranslator.fail_on = None
+    FakeTranslator.calls = []
+    monkeypatch.setattr(legal_chat_model, '_google_translator_cls', lambda: FakeTranslator)
+    monkeypatch.setattr(legal_chat_model, '_shared_cache', lambda: None)
+    return legal_chat_model.LegalAdviceGenerator()
+
+
+def _long_text():
+    return '\n\n'.join(f'Paragraph {i}. ' + 'word ' * 300 for i in range(4))
+
+
+def test_paragraph_chunks_round_trip_and_limit():
+    text = _long_text() + '\n\n' + 'Sentence here. ' * 300
+    chunks = legal_chat_model._paragraph_chunks(text, 2000)
+    assert ''.join(chunk + sep for chunk, sep in chunks) == text
+    assert all(len(chunk) <= 2000 for chunk, _ in chunks)
+
+
+def test_long_text_is_translated_in_chunks(advisor):
+    text = _long_text()
+    translated = advisor.translate_text(text, 'hi')
+    assert len(FakeTranslator.calls) > 1
+    assert all(len(call) <= legal_chat_model._TRANSLATE_CHUNK_CHARS for call in FakeTranslator.calls)
+    assert translated.count('<hi>') == len(FakeTranslator.calls)
+    # Cached: no further requests
+    FakeTranslator.calls = []
+    assert advisor.translate_text(text, 'hi') == translated
+    assert FakeTranslator.calls == []
+
+
+def test_failed_chunk_is_not_cached(advisor):
+    text = _long_text()
+    FakeTranslator.fail_on = 'Paragraph 2.'
+    partial = advisor.translate_text(text, 'hi')
+    assert 'Paragraph 2.' in partial and '<hi>Paragraph 2.' not in partial
+    assert len(advisor._translation_cache) == len(FakeTranslator.calls) - 1
+
+    # Once the upstream recovers the whole text is translated, not served half-English
+    FakeTranslator.fail_on = None
+    assert advisor.translate_text(text, 'hi').count('<hi>') == len(legal_chat_model._paragraph_chunks(
+        text, legal_chat_model._TRANSLATE_CHUNK_CHARS))
+
+
+def test_blocked_language_is_not_cached(advisor, monkeypatch):
+    monkeypatch.setitem(advisor._translate_blocked_until, 'hi', float('inf'))
+    text = _long_text()
+    assert advisor.translate_text(text, 'hi') == text
+    assert len(advisor._translation_cache) == 0
+
+
+def test_answer_cache_key_ignores_only_case_and_punctuation():
+    def key(question):
+        return legal_chat_model._answer_cache_key(question, 'en', 'model', None)
+
+    assert key('Can I file an FIR?') == key('  can i file an  fir ')
+    assert key('Can my landlord evict me?') != key('Can I evict my landlord?')
+    assert key('Can you sue me?') != key('Can I sue you?')
+    assert key('?!') is None
@@ -0,0 +1,64 @@
+"""Bounded in-process caches.
+
+Uses cachetools when installed; otherwise small OrderedDict-based stand-ins that
+cover what the app needs (get, item assignment, membership, pop, len). Like
+cachetools, neither is thread-safe: callers hold their own locks.
+"""
+
+from collections import OrderedDict
+import time
+
+try:
+    from cachetools import LRUCache, TTLCache
+except ImportError:
+    class LRUCache(OrderedDict):
+        """Evicts the least recently used entry once maxsize is exceeded."""
+
+        def __init__(self, maxsize: int):
+            super().__init__()
+            self.maxsize = maxsize
+
+        def __getitem__(self, key):
+            value = super().__getitem__(key)
+            self.move_to_end(key)
+            return value
+
+        def get(self, key, default=None):
+            return self[key] if key in self else default
+
+        def __setitem__(self, key, value):
+            super().__setitem__(key, value)
+            self.move_to_end(key)
+            while len(self) > self.maxsize:
+                self.popitem(last=False)
+
+    class TTLCache(LRUCache):
+        """LRUCache whose entries also expire ttl seconds after being set."""
+
+        def __init__(self, maxsize: int, ttl: float):
+            super().__init__(maxsize)
+            self.ttl = ttl
+
+        def __contains__(self, key):
+            item = OrderedDict.get(self, key)
+            if item is None:
+                return False
+            if item[0] <= time.monotonic():
+                OrderedDict.__delitem__(self, key)
+                return False
+            return True
+
+        def __getitem__(self, key):
+            if key not in self:
+                raise KeyError(key)
+            return super().__getitem__(key)[1]
+
+        def __setitem__(self, key, value):
+            super().__setitem__(key, (time.monotonic() + self.ttl, value))
+
+        def pop(self, key, *default):
+            if key in self:
+                return OrderedDict.pop(self, key)[1]
+            if default:
+                return default[0]
+            raise KeyError(key)
@@ -3,8 +3,9 @@ import json
 import sqlite3
 import time
 import secrets
+import threading
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,18 +17,58 @@ _DEFAULT_DB_PATH = os.environ.get(
 )
 
 
+# One connection per worker thread (and database file), reused across requests so
+# SQLite's page cache and statement cache stay warm instead of reopening per call.
+_tls = threading.local()
+
+
+def _apply_pragmas(conn: sqlite3.Connection) -> None:
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+    except sqlite3.DatabaseError as e:
+        logger.debug(f"Could not apply SQLite pragmas: {e}")
+
+
 def get_db_connection(db_path: str = _DEFAULT_DB_PATH) -> sqlite3.Connection:
-    """Return a SQLite connection with Row factory for dict-like access."""
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
+    """Return this thread's SQLite connection (Row factory, autocommit mode).
+
+    Connections are cached per thread; one closed by a caller is replaced on the
+    next call. In autocommit mode every statement commits on its own, so writers
+    that issue several statements wrap them in BEGIN/COMMIT themselves (see init_db).
+    """
+    conns = getattr(_tls, "conns", None)
+    if conns is None:
+        conns = _tls.conns = {}
+    conn = conns.get(db_path)
+    if conn is not None:
+        try:
+            conn.total_changes
+        except sqlite3.ProgrammingError:
+            conn = None
+    if conn is None:
+        # Statements are prepared once per connection and reused from sqlite3's LRU;
+        # 256 slots keep every filter combination of the listing queries cached.
+        conn = sqlite3.connect(
+            db_path, check_same_thread=False, isolation_level=None, cached_statements=256
+        )
+        conn.row_factory = sqlite3.Row
+        _apply_pragmas(conn)
+        conns[db_path] = conn
     return conn
 
 
+# Tables whose listings are served with an ETag from get_table_version().
+_VERSIONED_TABLES = ("chats", "forms")
+
+
 def init_db(db_path: str = _DEFAULT_DB_PATH) -> None:
     """Initialize database with required tables if they don't exist."""
     conn = get_db_connection(db_path)
     try:
         cur = conn.cursor()
+        cur.execute("BEGIN")
         
         # Chats table
         cur.execute(
@@ -144,11 +185,37 @@ def init_db(db_path: str = _DEFAULT_DB_PATH) -> None:
             """
         )
         
+        # Write counters for the listing ETags: bumped by trigger on every insert,
+        # update or delete, whoever the writer is, and read with one primary-key lookup.
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS table_versions (
+                name TEXT PRIMARY KEY,
+                version INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        for table in _VERSIONED_TABLES:
+            cur.execute("INSERT OR IGNORE INTO table_versions (name, version) VALUES (?, 0)", (table,))
+            for event in ("INSERT", "UPDATE", "DELETE"):
+                cur.execute(
+                    f"CREATE TRIGGER IF NOT EXISTS {table}_version_{event.lower()} AFTER {event} ON {table} "
+                    f"BEGIN UPDATE table_versions SET version = version + 1 WHERE name = '{table}'; END"
+                )
+        
         # Indexes
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_chats_timestamp ON chats(timestamp DESC)")
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_forms_timestamp ON forms(timestamp DESC)")
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_chats_language ON chats(language)")
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_forms_form_type ON forms(form_type)")
+        # (timestamp DESC, id DESC) matches the listing ORDER BY exactly, so
+        # "ORDER BY ... LIMIT n" walks the index with no temp B-tree sort.
+        cur.execute("DROP INDEX IF EXISTS idx_chats_timestamp")
+        cur.execute("DROP INDEX IF EXISTS idx_forms_timestamp")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_chats_timestamp_id ON chats(timestamp DESC, id DESC)")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_forms_timestamp_id ON forms(timestamp DESC, id DESC)")
+        # Equality filter first, then the listing order, so a language/form_type
+        # filtered listing is an index range scan with no sort either.
+        cur.execute("DROP INDEX IF EXISTS idx_chats_language")
+        cur.execute("DROP INDEX IF EXISTS idx_forms_form_type")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_chats_language_timestamp ON chats(language, timestamp DESC, id DESC)")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_forms_form_type_timestamp ON forms(form_type, timestamp DESC, id DESC)")
         cur.execute("CREATE INDEX IF NOT EXISTS idx_users_email ON users(email)")
         cur.execute("CREATE INDEX IF NOT EXISTS idx_users_verified ON users(is_verified)")
         cur.execute("CREATE INDEX IF NOT EXISTS idx_lawyer_profiles_email ON lawyer_profiles(email)")
@@ -162,9 +229,9 @@ def init_db(db_path: str = _DEFAULT_DB_PATH) -> None:
         conn.commit()
         logger.info("SQLite database initialized successfully")
     except Exception as e:
+        if conn.in_transaction:
+            conn.rollback()
         logger.warning(f"Database initialization failed (non-fatal): {e}")
-    finally:
-        conn.close()
 
 
 def insert_chat(
@@ -176,16 +243,13 @@ def insert_chat(
 ) -> int:
     """Insert a chat record and return its new id."""
     conn = get_db_connection(db_path)
-    try:
-        cur = conn.cursor()
-        cur.execute(
-            "INSERT INTO chats (question, answer, language, timestamp) VALUES (?, ?, ?, ?)",
-            (question, answer, language, timestamp),
-        )
-        conn.commit()
-        return int(cur.lastrowid)
-    finally:
-        conn.close()
+    cur = conn.cursor()
+    cur.execute(
+        "INSERT INTO chats (question, answer, language, timestamp) VALUES (?, ?, ?, ?)",
+        (question, answer, language, timestamp),
+    )
+    conn.commit()
+    return int(cur.lastrowid)
 
 
 def insert_form(
@@ -197,50 +261,106 @@ def insert_form(
 ) -> int:
     """Insert a form record and return its new id."""
     conn = get_db_connection(db_path)
-    try:
-        cur = conn.cursor()
-        cur.execute(
-            "INSERT INTO forms (form_type, form_text, responses_json, timestamp) VALUES (?, ?, ?, ?)",
-            (form_type, form_text, json.dumps(responses, ensure_ascii=False), timestamp),
-        )
-        conn.commit()
-        return int(cur.lastrowid)
-    finally:
-        conn.close()
+    cur = conn.cursor()
+    cur.execute(
+        "INSERT INTO forms (form_type, form_text, responses_json, timestamp) VALUES (?, ?, ?, ?)",
+        (form_type, form_text, json.dumps(responses, ensure_ascii=False), timestamp),
+    )
+    conn.commit()
+    return int(cur.lastrowid)
 
 
 def fetch_all_chats(db_path: str = _DEFAULT_DB_PATH) -> List[Dict[str, Any]]:
     """Fetch all chat records, newest first."""
     conn = get_db_connection(db_path)
-    try:
-        cur = conn.cursor()
-        cur.execute("SELECT id, question, answer, language, timestamp FROM chats ORDER BY timestamp DESC, id DESC")
-        rows = cur.fetchall()
-        return [dict(r) for r in rows]
-    finally:
-        conn.close()
+    cur = conn.cursor()
+    cur.execute("SELECT id, question, answer, language, timestamp FROM chats ORDER BY timestamp DESC, id DESC")
+    rows = cur.fetchall()
+    return [dict(r) for r in rows]
 
 
 def fetch_all_forms(db_path: str = _DEFAULT_DB_PATH) -> List[Dict[str, Any]]:
     """Fetch all form records, newest first."""
     conn = get_db_connection(db_path)
-    try:
-        cur = conn.cursor()
-        cur.execute("SELECT id, form_type, form_text, responses_json, timestamp FROM forms ORDER BY timestamp DESC, id DESC")
-        rows = cur.fetchall()
-        result = []
-        for row in rows:
-            r = dict(row)
-            # Parse responses_json for compatibility
-            if "responses_json" in r:
-                try:
-                    r["responses"] = json.loads(r["responses_json"])
-                except Exception:
-                    r["responses"] = {}
-            result.append(r)
-        return result
-    finally:
-        conn.close()
+    cur = conn.cursor()
+    cur.execute("SELECT id, form_type, form_text, responses_json, timestamp FROM forms ORDER BY timestamp DESC, id DESC")
+    rows = cur.fetchall()
+    result = []
+    for row in rows:
+        r = dict(row)
+        # Parse responses_json for compatibility
+        if "responses_json" in r:
+            try:
+                r["responses"] = json.loads(r["responses_json"])
+            except Exception:
+                r["responses"] = {}
+        result.append(r)
+    return result
+
+
+def _chats_filter_clause(
+    start: Optional[str],
+    end: Optional[str],
+    language: Optional[str],
+    q: Optional[str],
+    after: Optional[int] = None,
+) -> Tuple[str, List[Any]]:
+    conditions = []
+    params: List[Any] = []
+    if start:
+        conditions.append("timestamp >= ?")
+        params.append(start)
+    if end:
+        conditions.append("timestamp <= ?")
+        params.append(end)
+    if language:
+        conditions.append("language = ?")
+        params.append(language)
+    if q:
+        conditions.append("(question LIKE ? OR answer LIKE ?)")
+        like = f"%{q}%"
+        params.extend([like, like])
+    if after is not None:
+        # Keyset cursor: rows that come after row `after` in the listing order
+        conditions.append("(timestamp, id) < (SELECT timestamp, id FROM chats WHERE id = ?)")
+        params.append(after)
+    where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return where_clause, params
+
+
+def iter_chats_filtered(
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    language: Optional[str] = None,
+    q: Optional[str] = None,
+    db_path: str = _DEFAULT_DB_PATH,
+    limit: Optional[int] = None,
+    after: Optional[int] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Iterate filtered chats straight from the cursor, newest first."""
+    conn = get_db_connection(db_path)
+    where_clause, params = _chats_filter_clause(start, end, language, q, after)
+    sql = (
+        "SELECT id, question, answer, language, timestamp FROM chats "
+        + where_clause
+        + " ORDER BY timestamp DESC, id DESC"
+    )
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+    # Executed here, not on first iteration, so query errors surface to the caller
+    # before a streamed response has started.
+    cursor = conn.execute(sql, params)
+    return (dict(row) for row in cursor)
+
+
+def get_table_version(table: str, db_path: str = _DEFAULT_DB_PATH) -> int:
+    """Write counter of a listed table (chats, forms); changes on every insert, update or delete."""
+    if table not in _VERSIONED_TABLES:
+        raise ValueError(f"No version counter for table {table!r}")
+    conn = get_db_connection(db_path)
+    row = conn.execute("SELECT version FROM table_versions WHERE name = ?", (table,)).fetchone()
+    return row[0] if row else 0
 
 
 def fetch_chats_filtered(
@@ -249,38 +369,78 @@ def fetch_chats_filtered(
     language: Optional[str] = None,
     q: Optional[str] = None,
     db_path: str = _DEFAULT_DB_PATH,
+    limit: Optional[int] = None,
+    after: Optional[int] = None,
 ) -> List[Dict[str, Any]]:
     """Fetch chats with optional filters: start/end ISO timestamp, language, text query."""
+    return list(iter_chats_filtered(start, end, language, q, db_path, limit, after))
+
+
+def _forms_filter_clause(
+    start: Optional[str],
+    end: Optional[str],
+    form_type: Optional[str],
+    q: Optional[str],
+    after: Optional[int] = None,
+) -> Tuple[str, List[Any]]:
+    conditions = []
+    params: List[Any] = []
+    if start:
+        conditions.append("timestamp >= ?")
+        params.append(start)
+    if end:
+        conditions.append("timestamp <= ?")
+        params.append(end)
+    if form_type:
+        conditions.append("form_type = ?")
+        params.append(form_type)
+    if q:
+        conditions.append("(form_text LIKE ? OR responses_json LIKE ?)")
+        like = f"%{q}%"
+        params.extend([like, like])
+    if after is not None:
+        # Keyset cursor: rows that come after row `after` in the listing order
+        conditions.append("(timestamp, id) < (SELECT timestamp, id FROM forms WHERE id = ?)")
+        params.append(after)
+    where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return where_clause, params
+
+
+def iter_forms_filtered(
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    form_type: Optional[str] = None,
+    q: Optional[str] = None,
+    db_path: str = _DEFAULT_DB_PATH,
+    limit: Optional[int] = None,
+    after: Optional[int] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Iterate filtered forms straight from the cursor, newest first."""
     conn = get_db_connection(db_path)
-    try:
-        conditions = []
-        params: List[Any] = []
-        if start:
-            conditions.append("timestamp >= ?")
-            params.append(start)
-        if end:
-            conditions.append("timestamp <= ?")
-            params.append(end)
-        if language:
-            conditions.append("language = ?")
-            params.append(language)
-        if q:
-            conditions.append("(question LIKE ? OR answer LIKE ?)")
-            like = f"%{q}%"
-            params.extend([like, like])
-
-        where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
-        sql = (
-            "SELECT id, question, answer, language, timestamp FROM chats "
-            + where_clause
-            + " ORDER BY timestamp DESC, id DESC"
-        )
-        cur = conn.cursor()
-        cur.execute(sql, params)
-        rows = cur.fetchall()
-        return [dict(r) for r in rows]
-    finally:
-        conn.close()
+    where_clause, params = _forms_filter_clause(start, end, form_type, q, after)
+    sql = (
+        "SELECT id, form_type, form_text, responses_json, timestamp FROM forms "
+        + where_clause
+        + " ORDER BY timestamp DESC, id DESC"
+    )
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+    # Executed here, not on first iteration, so query errors surface to the caller
+    # before a streamed response has started.
+    cursor = conn.execute(sql, params)
+    return (_form_row(row) for row in cursor)
+
+
+def _form_row(row: sqlite3.Row) -> Dict[str, Any]:
+    r = dict(row)
+    # Parse responses_json for compatibility
+    if "responses_json" in r:
+        try:
+            r["responses"] = json.loads(r["responses_json"])
+        except Exception:
+            r["responses"] = {}
+    return r
 
 
 def fetch_forms_filtered(
@@ -289,48 +449,11 @@ def fetch_forms_filtered(
     form_type: Optional[str] = None,
     q: Optional[str] = None,
     db_path: str = _DEFAULT_DB_PATH,
+    limit: Optional[int] = None,
+    after: Optional[int] = None,
 ) -> List[Dict[str, Any]]:
     """Fetch forms with optional filters: start/end ISO timestamp, form_type, text query."""
-    conn = get_db_connection(db_path)
-    try:
-        conditions = []
-        params: List[Any] = []
-        if start:
-            conditions.append("timestamp >= ?")
-            params.append(start)
-        if end:
-            conditions.append("timestamp <= ?")
-            params.append(end)
-        if form_type:
-            conditions.append("form_type = ?")
-            params.append(form_type)
-        if q:
-            conditions.append("(form_text LIKE ? OR responses_json LIKE ?)")
-            like = f"%{q}%"
-            params.extend([like, like])
-
-        where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
-        sql = (
-            "SELECT id, form_type, form_text, responses_json, timestamp FROM forms "
-            + where_clause
-            + " ORDER BY timestamp DESC, id DESC"
-        )
-        cur = conn.cursor()
-        cur.execute(sql, params)
-        rows = cur.fetchall()
-        result = []
-        for row in rows:
-            r = dict(row)
-            # Parse responses_json for compatibility
-            if "responses_json" in r:
-                try:
-                    r["responses"] = json.loads(r["responses_json"])
-                except Exception:
-                    r["responses"] = {}
-            result.append(r)
-        return result
-    finally:
-        conn.close()
+    return list(iter_forms_filtered(start, end, form_type, q, db_path, limit, after))
 
 
 def fetch_recent_chats(
@@ -339,22 +462,19 @@ def fetch_recent_chats(
 ) -> List[Dict[str, Any]]:
     """Fetch the latest chat records to showcase past resolved cases."""
     conn = get_db_connection(db_path)
-    try:
-        clamp_limit = max(1, min(int(limit or 5), 50))
-        cur = conn.cursor()
-        cur.execute(
-            """
-            SELECT id, question, answer, language, timestamp
-            FROM chats
-            ORDER BY timestamp DESC, id DESC
-            LIMIT ?
-            """,
-            (clamp_limit,),
-        )
-        rows = cur.fetchall()
-        return [dict(r) for r in rows]
-    finally:
-        conn.close()
+    clamp_limit = max(1, min(int(limit or 5), 50))
+    cur = conn.cursor()
+    cur.execute(
+        """
+        SELECT id, question, answer, language, timestamp
+        FROM chats
+        ORDER BY timestamp DESC, id DESC
+        LIMIT ?
+        """,
+        (clamp_limit,),
+    )
+    rows = cur.fetchall()
+    return [dict(r) for r in rows]
 
 
 # Users helpers
@@ -364,73 +484,60 @@ def create_user(
     verification_token: Optional[str],
     created_at: str,
     db_path: str = _DEFAULT_DB_PATH,
+    is_verified: int = 0,
+    verified_at: Optional[str] = None,
 ) -> int:
     conn = get_db_connection(db_path)
-    try:
-        cur = conn.cursor()
-        cur.execute(
-            "INSERT INTO users (email, password_hash, is_verified, verification_token, created_at) VALUES (?, ?, 0, ?, ?)",
-            (email.lower(), password_hash, verification_token, created_at),
-        )
-        conn.commit()
-        return int(cur.lastrowid)
-    finally:
-        conn.close()
+    cur = conn.cursor()
+    cur.execute(
+        "INSERT INTO users (email, password_hash, is_verified, verification_token, created_at, verified_at) VALUES (?, ?, ?, ?, ?, ?)",
+        (email.lower(), password_hash, is_verified, verification_token, created_at, verified_at),
+    )
+    conn.commit()
+    return int(cur.lastrowid)
 
 
 def get_user_by_email(email: str, db_path: str = _DEFAULT_DB_PATH) -> Optional[Dict[str, Any]]:
     conn = get_db_connection(db_path)
-    try:
-        cur = conn.cursor()
-        cur.execute(
-            "SELECT id, email, password_hash, is_verified, verification_token, created_at, verified_at FROM users WHERE email = ?",
-            (email.lower(),),
-        )
-        row = cur.fetchone()
-        return dict(row) if row else None
-    finally:
-        conn.close()
+    cur = conn.cursor()
+    cur.execute(
+        "SELECT id, email, password_hash, is_verified, verification_token, created_at, verified_at FROM users WHERE email = ?",
+        (email.lower(),),
+    )
+    row = cur.fetchone()
+    return dict(row) if row else None
 
 
 def get_user_by_verification_token(token: str, db_path: str = _DEFAULT_DB_PATH) -> Optional[Dict[str, Any]]:
     conn = get_db_connection(db_path)
-    try:
-        cur = conn.cursor()
-        cur.execute(
-            "SELECT id, email, password_hash, is_verified, verification_token, created_at, verified_at FROM users WHERE verification_token = ?",
-            (token,),
-        )
-        row = cur.fetchone()
-        return dict(row) if row else None
-    finally:
-        conn.close()
+    cur = conn.cursor()
+    cur.execute(
+        "SELECT id, email, password_hash, is_verified, verification_token, created_at, verified_at FROM users WHERE verification_token = ?",
+        (token,),
+    )
+    row = cur.fetchone()
+    return dict(row) if row else None
 
 
 def set_user_verified(user_id: int, verified_at: str, db_path: str = _DEFAULT_DB_PATH) -> None:
     conn = get_db_connection(db_path)
-    try:
-        cur = conn.cursor()
-        cur.execute(
-            "UPDATE users SET is_verified = 1, verification_token = NULL, verified_at = ? WHERE id = ?",
-            (verified_at, user_id),
-        )
-        conn.commit()
-    finally:
-        conn.close()
+    cur = conn.cursor()
+    cur.execute(
+        "UPDATE users SET is_verified = 1, verification_token = NULL, verified_at = ? WHERE id = ?",
+        (verified_at, user_id),
+    )
+    conn.commit()
 
 
 def set_verification_token(user_id: int, token: str, db_path: str = _DEFAULT_DB_PATH) -> None:
     """Set or replace a user's verification token (used for resend flows)."""
     conn = get_db_connection(db_path)
-    try:
-        cur = conn.cursor()
-        cur.execute(
-            "UPDATE users SET verification_token = ?, is_verified = 0 WHERE id = ?",
-            (token, user_id),
-        )
-        conn.commit()
-    finally:
-        conn.close()
+    cur = conn.cursor()
+    cur.execute(
+        "UPDATE users SET verification_token = ?, is_verified = 0 WHERE id = ?",
+        (token, user_id),
+    )
+    conn.commit()
 
 
 def _now_iso() -> str:
@@ -458,18 +565,15 @@ def _serialize_lawyer_doc(doc: Dict[str, Any]) -> Dict[str, Any]:
 
 def get_lawyer_profile_by_id(lawyer_id: int, db_path: str = _DEFAULT_DB_PATH) -> Optional[Dict[str, Any]]:
     conn = get_db_connection(db_path)
-    try:
-        cur = conn.cursor()
-        cur.execute(
-            "SELECT * FROM lawyer_profiles WHERE id = ?",
-            (lawyer_id,),
-        )
-        row = cur.fetchone()
-        if row:
-            return _serialize_lawyer_doc(dict(row))
-        return None
-    finally:
-        conn.close()
+    cur = conn.cursor()
+    cur.execute(
+        "SELECT * FROM lawyer_profiles WHERE id = ?",
+        (lawyer_id,),
+    )
+    row = cur.fetchone()
+    if row:
+        return _serialize_lawyer_doc(dict(row))
+    return None
 
 
 def list_lawyer_profiles(
@@ -478,22 +582,19 @@ def list_lawyer_profiles(
     db_path: str = _DEFAULT_DB_PATH,
 ) -> List[Dict[str, Any]]:
     conn = get_db_connection(db_path)
-    try:
-        query = "SELECT * FROM lawyer_profiles"
-        params = []
-        if only_available:
-            query += " WHERE is_available = 1"
-        query += " ORDER BY is_available DESC, updated_at DESC"
-        if limit:
-            query += " LIMIT ?"
-            params.append(limit)
-        
-        cur = conn.cursor()
-        cur.execute(query, params)
-        rows = cur.fetchall()
-        return [_serialize_lawyer_doc(dict(row)) for row in rows]
-    finally:
-        conn.close()
+    query = "SELECT * FROM lawyer_profiles"
+    params = []
+    if only_available:
+        query += " WHERE is_available = 1"
+    query += " ORDER BY is_available DESC, updated_at DESC"
+    if limit:
+        query += " LIMIT ?"
+        params.append(limit)
+    
+    cur = conn.cursor()
+    cur.execute(query, params)
+    rows = cur.fetchall()
+    return [_serialize_lawyer_doc(dict(row)) for row in rows]
 
 
 def set_lawyer_availability(
@@ -504,27 +605,24 @@ def set_lawyer_availability(
     db_path: str = _DEFAULT_DB_PATH,
 ) -> None:
     conn = get_db_connection(db_path)
-    try:
-        updates = []
-        params = []
-        if is_available is not None:
-            updates.append("is_available = ?")
-            params.append(1 if is_available else 0)
-        if status:
-            updates.append("status = ?")
-            params.append(status)
-        if updates:
-            updates.append("updated_at = ?")
-            params.append(_now_iso())
-            params.append(lawyer_id)
-            cur = conn.cursor()
-            cur.execute(
-                f"UPDATE lawyer_profiles SET {', '.join(updates)} WHERE id = ?",
-                params,
-            )
-            conn.commit()
-    finally:
-        conn.close()
+    updates = []
+    params = []
+    if is_available is not None:
+        updates.append("is_available = ?")
+        params.append(1 if is_available else 0)
+    if status:
+        updates.append("status = ?")
+        params.append(status)
+    if updates:
+        updates.append("updated_at = ?")
+        params.append(_now_iso())
+        params.append(lawyer_id)
+        cur = conn.cursor()
+        cur.execute(
+            f"UPDATE lawyer_profiles SET {', '.join(updates)} WHERE id = ?",
+            params,
+        )
+        conn.commit()
 
 
 def create_subscription_purchase(
@@ -533,44 +631,41 @@ def create_subscription_purchase(
 ) -> Dict[str, Any]:
     """Create a new subscription purchase and return it."""
     conn = get_db_connection(db_path)
-    try:
-        now = _now_iso()
-        subscription_id = f"SUB_{int(time.time())}_{secrets.token_hex(4)}"
-        
-        cur = conn.cursor()
-        cur.execute(
-            """
-            INSERT INTO subscription_purchases 
-            (subscription_id, user_id, tier_id, tier_name, price, payment_reference, status, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                subscription_id,
-                purchase["user_id"],
-                purchase["tier_id"],
-                purchase["tier_name"],
-                purchase["price"],
-                purchase["payment_reference"],
-                purchase.get("status", "active"),
-                now,
-            ),
-        )
-        conn.commit()
-        purchase_id = int(cur.lastrowid)
-        
-        return {
-            "id": purchase_id,
-            "subscription_id": subscription_id,
-            "user_id": purchase["user_id"],
-            "tier_id": purchase["tier_id"],
-            "tier_name": purchase["tier_name"],
-            "price": purchase["price"],
-            "payment_reference": purchase["payment_reference"],
-            "status": purchase.get("status", "active"),
-            "created_at": now,
-        }
-    finally:
-        conn.close()
+    now = _now_iso()
+    subscription_id = f"SUB_{int(time.time())}_{secrets.token_hex(4)}"
+    
+    cur = conn.cursor()
+    cur.execute(
+        """
+        INSERT INTO subscription_purchases 
+        (subscription_id, user_id, tier_id, tier_name, price, payment_reference, status, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (
+            subscription_id,
+            purchase["user_id"],
+            purchase["tier_id"],
+            purchase["tier_name"],
+            purchase["price"],
+            purchase["payment_reference"],
+            purchase.get("status", "active"),
+            now,
+        ),
+    )
+    conn.commit()
+    purchase_id = int(cur.lastrowid)
+    
+    return {
+        "id": purchase_id,
+        "subscription_id": subscription_id,
+        "user_id": purchase["user_id"],
+        "tier_id": purchase["tier_id"],
+        "tier_name": purchase["tier_name"],
+        "price": purchase["price"],
+        "payment_reference": purchase["payment_reference"],
+        "status": purchase.get("status", "active"),
+        "created_at": now,
+    }
 
 
 def get_subscription_purchase(
@@ -579,29 +674,26 @@ def get_subscription_purchase(
 ) -> Optional[Dict[str, Any]]:
     """Get a subscription purchase by its database id."""
     conn = get_db_connection(db_path)
-    try:
-        cur = conn.cursor()
-        # Try to find by id first (if it's an integer)
-        if isinstance(subscription_id, int):
-            cur.execute(
-                "SELECT * FROM subscription_purchases WHERE id = ?",
-                (subscription_id,),
-            )
-            row = cur.fetchone()
-            if row:
-                return dict(row)
-        
-        # Try to find by subscription_id string
+    cur = conn.cursor()
+    # Try to find by id first (if it's an integer)
+    if isinstance(subscription_id, int):
         cur.execute(
-            "SELECT * FROM subscription_purchases WHERE subscription_id = ?",
-            (str(subscription_id),),
+            "SELECT * FROM subscription_purchases WHERE id = ?",
+            (subscription_id,),
         )
         row = cur.fetchone()
         if row:
             return dict(row)
-        return None
-    finally:
-        conn.close()
+    
+    # Try to find by subscription_id string
+    cur.execute(
+        "SELECT * FROM subscription_purchases WHERE subscription_id = ?",
+        (str(subscription_id),),
+    )
+    row = cur.fetchone()
+    if row:
+        return dict(row)
+    return None
 
 
 def get_user_subscriptions(
@@ -611,20 +703,17 @@ def get_user_subscriptions(
 ) -> List[Dict[str, Any]]:
     """Get all subscriptions for a user, optionally filtered by status."""
     conn = get_db_connection(db_path)
-    try:
-        query = "SELECT * FROM subscription_purchases WHERE user_id = ?"
-        params = [user_id]
-        if status:
-            query += " AND status = ?"
-            params.append(status)
-        query += " ORDER BY created_at DESC"
-        
-        cur = conn.cursor()
-        cur.execute(query, params)
-        rows = cur.fetchall()
-        return [dict(row) for row in rows]
-    finally:
-        conn.close()
+    query = "SELECT * FROM subscription_purchases WHERE user_id = ?"
+    params = [user_id]
+    if status:
+        query += " AND status = ?"
+        params.append(status)
+    query += " ORDER BY created_at DESC"
+    
+    cur = conn.cursor()
+    cur.execute(query, params)
+    rows = cur.fetchall()
+    return [dict(row) for row in rows]
 
 
 def insert_lawyer_booking(
@@ -632,43 +721,40 @@ def insert_lawyer_booking(
     db_path: str = _DEFAULT_DB_PATH,
 ) -> Dict[str, Any]:
     conn = get_db_connection(db_path)
-    try:
-        now = _now_iso()
-        
-        cur = conn.cursor()
-        cur.execute(
-            """
-            INSERT INTO lawyer_bookings 
-            (booking_id, tier_id, tier_name, price, user_id, preferred_lawyer_id, 
-             customer_name, customer_phone, customer_email, issue_description, 
-             payment_reference, subscription_id, status, notes, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                booking["booking_id"],
-                booking["tier_id"],
-                booking.get("tier_name"),
-                booking["price"],
-                booking.get("user_id"),
-                booking.get("preferred_lawyer_id"),
-                booking.get("customer_name"),
-                booking.get("customer_phone"),
-                booking.get("customer_email"),
-                booking.get("issue_description"),
-                booking.get("payment_reference"),
-                booking.get("subscription_id"),
-                booking.get("status", "pending"),
-                booking.get("notes"),
-                now,
-            ),
-        )
-        conn.commit()
-        
-        return {
-            "booking_id": booking["booking_id"],
-            "tier_id": booking["tier_id"],
-            "status": booking.get("status", "pending"),
-            "created_at": now,
-        }
-    finally:
-        conn.close()
+    now = _now_iso()
+    
+    cur = conn.cursor()
+    cur.execute(
+        """
+        INSERT INTO lawyer_bookings 
+        (booking_id, tier_id, tier_name, price, user_id, preferred_lawyer_id, 
+         customer_name, customer_phone, customer_email, issue_description, 
+         payment_reference, subscription_id, status, notes, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (
+            booking["booking_id"],
+            booking["tier_id"],
+            booking.get("tier_name"),
+            booking["price"],
+            booking.get("user_id"),
+            booking.get("preferred_lawyer_id"),
+            booking.get("customer_name"),
+            booking.get("customer_phone"),
+            booking.get("customer_email"),
+            booking.get("issue_description"),
+            booking.get("payment_reference"),
+            booking.get("subscription_id"),
+            booking.get("status", "pending"),
+            booking.get("notes"),
+            now,
+        ),
+    )
+    conn.commit()
+    
+    return {
+        "booking_id": booking["booking_id"],
+        "tier_id": booking["tier_id"],
+        "status": booking.get("status", "pending"),
+        "created_at": now,
+    }